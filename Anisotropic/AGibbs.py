@@ -1,11 +1,10 @@
-from math import exp
-import random
-import numpy as np
+from stencil import StencilSampler, anisotropic_kernel
 
 
 def AGibbs(Sample, height, width, ITERA,
            alpha, Beta_h, Beta_v, Beta_d1, Beta_d2,
-           T, Yobs=None, lam=0.0, anneal=False, T0=None, Tf=None):
+           T, Yobs=None, lam=0.0, anneal=False, T0=None, Tf=None,
+           backend="python", recorder=None, scan="random"):
     """
     Anisotropic Gibbs sampler for binary image denoising via an Ising MRF posterior,
     extended to separate horizontal, vertical, and diagonal couplings,
@@ -59,75 +58,28 @@ def AGibbs(Sample, height, width, ITERA,
     T0, Tf : float, optional
         Starting and final temperatures for annealing. Defaults: T0=T, Tf=0.1*T0.
 
+    backend : {"python", "numba"}
+        "python" runs the reference per-site loop.
+        "numba" runs the same random-scan sweeps as a compiled kernel
+        (Numba RNG, seed it with jit_backend.seed_jit). Falls back to
+        "python" with a warning if Numba is not installed.
+
+    recorder : TrajectoryRecorder, optional
+        If given, a snapshot of Sample is appended every recorder.every
+        sweeps (the caller closes the recorder).
+
+    scan : {"random", "colour"}
+        "random" keeps the shuffled single-site sweeps. "colour" updates
+        every colour class of non-interacting sites at once (vectorized,
+        see stencil.colouring).
+
     Returns
     -------
     SampleOut : 2D numpy array (height x width)
         Final denoised configuration (without padding).
     """
 
-    # original image dimensions
-    H = height + 2
-    W = width + 2
-    Nsites = height * width
-
-    # fallback for missing Yobs
-    if Yobs is None:
-        Yobs = Sample
-
-    # annealing parameters
-    if anneal:
-        if T0 is None:
-            T0 = T
-        if Tf is None:
-            Tf = 0.1 * T0
-
-    # precompute interior indices
-    indices = np.zeros(Nsites, dtype=int)
-    t = 0
-    for i in range(1, H - 1):
-        for j in range(1, W - 1):
-            indices[t] = j + i * W
-            t += 1
-
-    # main Gibbs loop
-    for sweep in range(ITERA):
-
-        # simulated annealing schedule
-        if anneal:
-            T_eff = T0 * ((Tf / T0) ** (sweep / max(1, ITERA - 1)))
-        else:
-            T_eff = T
-
-        random.shuffle(indices)
-
-        for k in indices:
-            # observed pixel
-            yk = Yobs[k]
-
-            # compute local energy contribution from anisotropic neighbours
-            # horizontal: left/right
-            # vertical: up/down
-            # diagonal1: top-left / bottom-right
-            # diagonal2: top-right / bottom-left
-            energy = (
-                alpha
-                + Beta_h * (Sample[k - 1] + Sample[k + 1])
-                + Beta_v * (Sample[k - W] + Sample[k + W])
-                + Beta_d1 * (Sample[k - W - 1] + Sample[k + W + 1])
-                + Beta_d2 * (Sample[k - W + 1] + Sample[k + W - 1])
-                - lam * yk  # data fidelity term
-            )
-
-            # conditional probability 
-            p_plus = 1.0 / (1.0 + exp(2.0 * energy / T_eff))
-
-            # sample from Bernoulli
-            Sample[k] = 1 if random.random() < p_plus else -1
-
-    # reshape 1D sample into 2D output without border
-    SampleOut = np.zeros((H, W))
-    for i in range(1, H - 1):
-        for j in range(1, W - 1):
-            SampleOut[i][j] = Sample[j + i * W]
-
-    return SampleOut[1:-1, 1:-1]
+    return StencilSampler(Sample, height, width, ITERA, anisotropic_kernel(Beta_h, Beta_v, Beta_d1, Beta_d2), alpha, T,
+                          Yobs=Yobs, lam=lam, anneal=anneal, T0=T0, Tf=Tf,
+                          method="gibbs", scan=scan, backend=backend, recorder=recorder,
+                          caller="AGibbs")
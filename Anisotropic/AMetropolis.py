@@ -1,9 +1,7 @@
-from math import exp
-import random
-import numpy as np
+from stencil import StencilSampler, anisotropic_kernel
 
 
-def AMetropolis(Sample,height,width,ITERA,Alpha,Beta_h, Beta_v, Beta_d1, Beta_d2,T,Yobs=None,lam=0.0,anneal=False,T0=None,Tf=None):
+def AMetropolis(Sample,height,width,ITERA,Alpha,Beta_h, Beta_v, Beta_d1, Beta_d2,T,Yobs=None,lam=0.0,anneal=False,T0=None,Tf=None,backend="python",recorder=None,scan="random"):
     """
     Anisotropic Metropolis-Hastings sampler for binary MRF denoising.
 
@@ -67,94 +65,28 @@ def AMetropolis(Sample,height,width,ITERA,Alpha,Beta_h, Beta_v, Beta_d1, Beta_d2
     T0, Tf : float, optional
         Start and end temperatures for annealing. Defaults: T0=T, Tf=0.1*T0.
 
+    backend : {"python", "numba"}
+        "python" runs the reference per-site loop.
+        "numba" runs the same random-scan sweeps as a compiled kernel
+        (Numba RNG, seed it with jit_backend.seed_jit). Falls back to
+        "python" with a warning if Numba is not installed.
+
+    recorder : TrajectoryRecorder, optional
+        If given, a snapshot of Sample is appended every recorder.every
+        sweeps (the caller closes the recorder).
+
+    scan : {"random", "colour"}
+        "random" keeps the shuffled single-site sweeps. "colour" updates
+        every colour class of non-interacting sites at once (vectorized,
+        see stencil.colouring).
+
     Returns
     -------
     SampleOut_no_border : 2D numpy array of shape (height, width)
         Final spin configuration cropped to remove the border.
     """
 
-    H = height + 2   # total rows including 1-pixel border
-    W = width + 2    # total cols including 1-pixel border
-    Nsites = height * width  # number of interior pixels
-
-    # If Yobs is not provided, fall back to prior-only behaviour
-    if Yobs is None:
-        Yobs = Sample
-
-    # Annealing setup
-    if anneal:
-        if T0 is None:
-            T0 = T
-        if Tf is None:
-            Tf = 0.1 * T0
-
-    # Build list of interior indices (skip padded frame)
-    indices = np.zeros(Nsites, dtype=int)
-    t = 0
-    for i in range(1, H - 1):
-        for j in range(1, W - 1):
-            indices[t] = j + i * W
-            t += 1
-
-    # Main Metropolis loop over sweeps
-    for sweep in range(ITERA):
-
-        # Select current effective temperature for this sweep
-        if anneal:
-            # exponential decay from T0 down to Tf
-            T_eff = T0 * ((Tf / T0) ** (sweep / max(1, ITERA - 1)))
-        else:
-            T_eff = T
-
-        random.shuffle(indices)
-
-        for k in indices:
-            # Current spin at site k
-            current = Sample[k]  # ±1
-
-            # Proposed flip
-            candidate = -current
-
-            # Observed pixel value (data fidelity term)
-            yk = Yobs[k]  # ±1
-
-            # Compute local energy contribution before the flip:
-            # Minus lam * yk * spin is the likelihood attachment.
-            E_old = (
-                Alpha * current
-                + Beta_h  * (current * Sample[k - 1]       + current * Sample[k + 1])
-                + Beta_v  * (current * Sample[k - W]       + current * Sample[k + W])
-                + Beta_d1 * (current * Sample[k - W - 1]   + current * Sample[k + W + 1])
-                + Beta_d2 * (current * Sample[k - W + 1]   + current * Sample[k + W - 1])
-                - lam     * yk * current
-            )
-
-            # Compute local energy after flipping that one spin:
-            E_new = (
-                Alpha * candidate
-                + Beta_h  * (candidate * Sample[k - 1]       + candidate * Sample[k + 1])
-                + Beta_v  * (candidate * Sample[k - W]       + candidate * Sample[k + W])
-                + Beta_d1 * (candidate * Sample[k - W - 1]   + candidate * Sample[k + W + 1])
-                + Beta_d2 * (candidate * Sample[k - W + 1]   + candidate * Sample[k + W - 1])
-                - lam     * yk * candidate
-            )
-
-            Delta_E = E_new - E_old  # energy change for this flip
-
-            # Metropolis acceptance rule with temperature T_eff:
-            # If energy goes down (Delta_E < 0) accept immediately.
-            # Otherwise accept with prob exp(-Delta_E / T_eff).
-            if Delta_E < 0:
-                Sample[k] = candidate
-            else:
-                if random.random() < exp(-Delta_E / T_eff):
-                    Sample[k] = candidate
-
-    # Convert flattened lattice with border back to 2D and drop the artificial border
-    SampleOut = np.zeros((H, W))
-    for i in range(1, H - 1):
-        for j in range(1, W - 1):
-            SampleOut[i][j] = Sample[j + i * W]
-
-    SampleOut_no_border = SampleOut[1:-1, 1:-1]
-    return SampleOut_no_border
+    return StencilSampler(Sample, height, width, ITERA, anisotropic_kernel(Beta_h, Beta_v, Beta_d1, Beta_d2), Alpha, T,
+                          Yobs=Yobs, lam=lam, anneal=anneal, T0=T0, Tf=Tf,
+                          method="metropolis", scan=scan, backend=backend, recorder=recorder,
+                          caller="AMetropolis")
@@ -1,9 +1,9 @@
-import numpy as np
-import random
+from stencil import StencilSampler, isotropic_kernel
 
 
 def Gibbs(Sample, height, width, ITERA, alpha, Beta, T,
-          Yobs=None, lam=0.0, anneal=False, T0=None, Tf=None):
+          Yobs=None, lam=0.0, anneal=False, T0=None, Tf=None,
+          backend="python", recorder=None, scan="random"):
     """
     Gibbs sampler for binary image denoising via an Ising MRF posterior,
     with optional simulated annealing.
@@ -58,75 +58,28 @@ def Gibbs(Sample, height, width, ITERA, alpha, Beta, T,
     Tf : float, optional
         Final temperature for annealing (default = 0.1 * T0).
 
+    backend : {"python", "numba"}
+        "python" runs the reference per-site loop.
+        "numba" runs the same random-scan sweeps as a compiled kernel
+        (Numba RNG, seed it with jit_backend.seed_jit). Falls back to
+        "python" with a warning if Numba is not installed.
+
+    recorder : TrajectoryRecorder, optional
+        If given, a snapshot of Sample is appended every recorder.every
+        sweeps (the caller closes the recorder).
+
+    scan : {"random", "colour"}
+        "random" keeps the shuffled single-site sweeps. "colour" updates
+        every colour class of non-interacting sites at once (vectorized,
+        see stencil.colouring).
+
     Returns
     -------
     Out_inner : 2D numpy array
         Final configuration (no padding).
     """
 
-    H = height + 2
-    W = width + 2
-    Nsites = height * width
-
-    # Fallback for missing observation (pure prior mode)
-    if Yobs is None:
-        Yobs = Sample
-
-    # Setup annealing parameters
-    if anneal:
-        if T0 is None:
-            T0 = T
-        if Tf is None:
-            Tf = 0.1 * T0
-
-    # Precompute linear indices for interior pixels (exclude padded border)
-    indices = np.zeros(Nsites, dtype=int)
-    t = 0
-    for i in range(1, H - 1):
-        base = i * W
-        for j in range(1, W - 1):
-            indices[t] = base + j
-            t += 1
-
-    # Main Gibbs sampling loop
-    for sweep in range(ITERA):
-
-        #Simulated Annealing Schedule
-        if anneal:
-            # Exponential decay from T0 to Tf
-            T_eff = T0 * ((Tf / T0) ** (sweep / max(1, ITERA - 1)))
-        else:
-            T_eff = T
-        np.random.shuffle(indices)
-
-        for k in indices:
-            yk = Yobs[k]
-
-            # 4-neighbour sum (standard Ising coupling)
-            nb_sum = (
-                Sample[k - 1] +
-                Sample[k + 1] +
-                Sample[k - W] +
-                Sample[k + W]
-            )
-
-            # α + β * nb_sum - λ * yk
-            # Negative β favours alignment.
-            h_loc = alpha + Beta * nb_sum - lam * yk
-
-            # Conditional probability for X_k = +1.
-            #   p_plus = 1 / (1 + exp( 2*h_loc / T_eff ))
-            p_plus = 1.0 / (1.0 + np.exp(2.0 * h_loc / T_eff))
-
-            # Draw new spin according to conditional probability.
-            Sample[k] = 1 if random.random() < p_plus else -1
-
-    # Reconstruct 2D array and crop border.
-    Out_full = np.zeros((H, W))
-    for i in range(1, H - 1):
-        base = i * W
-        for j in range(1, W - 1):
-            Out_full[i, j] = Sample[base + j]
-
-    Out_inner = Out_full[1:-1, 1:-1]
-    return Out_inner
+    return StencilSampler(Sample, height, width, ITERA, isotropic_kernel(Beta), alpha, T,
+                          Yobs=Yobs, lam=lam, anneal=anneal, T0=T0, Tf=Tf,
+                          method="gibbs", scan=scan, backend=backend, recorder=recorder,
+                          caller="Gibbs")
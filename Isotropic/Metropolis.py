@@ -1,9 +1,9 @@
-import numpy as np
-import random
+from stencil import StencilSampler, isotropic_kernel
 
 
 def Metropolis(Sample, height, width, ITERA, alpha, Beta, T,
-               Yobs=None, lam=0.0, anneal=False, T0=None, Tf=None):
+               Yobs=None, lam=0.0, anneal=False, T0=None, Tf=None,
+               backend="python", recorder=None, scan="random"):
     """
     Metropolis-Hastings sampler for a binary MRF / Ising model with optional simulated annealing.
 
@@ -55,80 +55,28 @@ def Metropolis(Sample, height, width, ITERA, alpha, Beta, T,
     Tf : float, optional
         Final temperature for annealing. Defaults to 0.1 * T0.
 
+    backend : {"python", "numba"}
+        "python" runs the reference per-site loop.
+        "numba" runs the same random-scan sweeps as a compiled kernel
+        (Numba RNG, seed it with jit_backend.seed_jit). Falls back to
+        "python" with a warning if Numba is not installed.
+
+    recorder : TrajectoryRecorder, optional
+        If given, a snapshot of Sample is appended every recorder.every
+        sweeps (the caller closes the recorder).
+
+    scan : {"random", "colour"}
+        "random" keeps the shuffled single-site sweeps. "colour" updates
+        every colour class of non-interacting sites at once (vectorized,
+        see stencil.colouring).
+
     Returns
     -------
     Out_inner : 2D numpy array (height, width)
         Final spins cropped to remove border.
     """
 
-    H = height + 2
-    W = width + 2
-    Nsites = height * width
-
-    # Fallback: if no observed image, reuse Sample (lam=0 → pure prior)
-    if Yobs is None:
-        Yobs = Sample
-
-    # Annealing setup
-    if anneal:
-        if T0 is None:
-            T0 = T
-        if Tf is None:
-            Tf = 0.1 * T0
-
-    # Interior indices (skip padded border)
-    indices = np.zeros(Nsites, dtype=int)
-    t = 0
-    for i in range(1, H - 1):
-        base = i * W
-        for j in range(1, W - 1):
-            indices[t] = base + j
-            t += 1
-
-    # Main Metropolis loop
-    for sweep in range(ITERA):
-
-        # Simulated Annealing Schedule 
-        if anneal:
-            # Exponential decay of temperature across sweeps
-            T_eff = T0 * ((Tf / T0) ** (sweep / max(1, ITERA - 1)))
-        else:
-            T_eff = T
-
-        np.random.shuffle(indices)
-
-        for k in indices:
-            s = Sample[k]    # current spin (±1)
-            yk = Yobs[k]     # observed pixel (±1)
-
-            # 4-neighbour contribution
-            nb_sum = (
-                Sample[k - 1] +
-                Sample[k + 1] +
-                Sample[k - W] +
-                Sample[k + W]
-            )
-
-
-            E_cur = alpha * s + Beta * s * nb_sum - lam * yk * s
-            s_new = -s
-            E_new = alpha * s_new + Beta * s_new * nb_sum - lam * yk * s_new
-
-            dE = E_new - E_cur
-
-            # Metropolis acceptance rule
-            if dE <= 0:
-                Sample[k] = s_new
-            else:
-                if random.random() < np.exp(-dE / T_eff):
-                    Sample[k] = s_new
-
-    # Convert back to 2D and remove padding
-    Out_full = np.zeros((H, W))
-    for i in range(1, H - 1):
-        base = i * W
-        for j in range(1, W - 1):
-            Out_full[i, j] = Sample[base + j]
-
-    Out_inner = Out_full[1:-1, 1:-1]
-    return Out_inner
+    return StencilSampler(Sample, height, width, ITERA, isotropic_kernel(Beta), alpha, T,
+                          Yobs=Yobs, lam=lam, anneal=anneal, T0=T0, Tf=Tf,
+                          method="metropolis", scan=scan, backend=backend, recorder=recorder,
+                          caller="Metropolis")
@@ -0,0 +1,65 @@
+import time
+import random
+import numpy as np
+from Isotropic.Metropolis import Metropolis
+from Isotropic.Gibbs import Gibbs
+from Anisotropic.AMetropolis import AMetropolis
+from Anisotropic.AGibbs import AGibbs
+from jit_backend import njit, seed_jit
+from stencil import random_sample
+
+
+#Wall-clock time of the pure-Python and Numba backends of the four samplers
+#(speedup per sampler), plus the time of scan="colour" for reference.
+#Statistical equivalence of the backends is checked in tests/test_backends.py.
+
+
+Alpha = 0.05 #site field
+Beta = -0.4 #interaction
+Beta_h = -0.3
+Beta_v = -0.3
+Beta_d1 = -0.1
+Beta_d2 = -0.1
+T = 1.0
+lam = 0.2
+
+SAMPLERS = {
+    "Gibbs": lambda S, h, w, n, Y, b, s="random": Gibbs(S, h, w, n, Alpha, Beta, T, Yobs=Y, lam=lam,
+                                                        backend=b, scan=s),
+    "Metropolis": lambda S, h, w, n, Y, b, s="random": Metropolis(S, h, w, n, Alpha, Beta, T, Yobs=Y, lam=lam,
+                                                                  backend=b, scan=s),
+    "AGibbs": lambda S, h, w, n, Y, b, s="random": AGibbs(S, h, w, n, Alpha, Beta_h, Beta_v, Beta_d1, Beta_d2, T,
+                                                          Yobs=Y, lam=lam, backend=b, scan=s),
+    "AMetropolis": lambda S, h, w, n, Y, b, s="random": AMetropolis(S, h, w, n, Alpha, Beta_h, Beta_v, Beta_d1,
+                                                                    Beta_d2, T, Yobs=Y, lam=lam, backend=b, scan=s),
+}
+
+
+def speedup(run, height=100, width=120, ITERA=5):
+    Yobs = random_sample(height, width)
+    run(random_sample(height, width), height, width, 1, Yobs, "numba") #compile outside the timing
+    times = {}
+    for backend in ("python", "numba"):
+        Sample = random_sample(height, width)
+        t0 = time.perf_counter()
+        run(Sample, height, width, ITERA, Yobs, backend)
+        times[backend] = time.perf_counter() - t0
+    #vectorized colour-class updates (pure numpy, not the random-scan semantics)
+    Sample = random_sample(height, width)
+    t0 = time.perf_counter()
+    run(Sample, height, width, ITERA, Yobs, "python", "colour")
+    times["colour"] = time.perf_counter() - t0
+    return times
+
+
+if __name__ == "__main__":
+    if njit is None:
+        print("Numba is not installed: both backends run the same Python loop.")
+    random.seed(0)
+    np.random.seed(0)
+    seed_jit(0)
+    print(f"{'sampler':<12} {'python [s]':>10} {'numba [s]':>10} {'speedup':>8} {'colour [s]':>10}")
+    for name, run in SAMPLERS.items():
+        times = speedup(run)
+        print(f"{name:<12} {times['python']:>10.3f} {times['numba']:>10.4f} "
+              f"{times['python'] / times['numba']:>7.0f}x {times['colour']:>10.4f}")
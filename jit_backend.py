@@ -0,0 +1,92 @@
+import numpy as np
+import warnings
+
+# Numba is optional: without it every sampler keeps its pure-Python loop.
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+BACKENDS = ("python", "numba")
+
+
+def check_backend(backend):
+    """Raise ValueError for an unknown backend name."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+
+
+def use_jit(backend, name, stacklevel=3):
+    """
+    Decide whether a sampler should run its compiled kernel.
+
+    backend    : "python" or "numba".
+    name       : sampler name, only used in the fallback warning.
+    stacklevel : passed to warnings.warn, the default points at the caller
+                 of the function calling use_jit.
+    Returns True if the Numba kernel is available and requested.
+    """
+    check_backend(backend)
+    if backend == "numba" and njit is None:
+        warnings.warn(f"Numba is not installed, {name} falls back to the pure-Python sweep.",
+                      stacklevel=stacklevel)
+        return False
+    return backend == "numba"
+
+
+def jit(func):
+    """Compile func with Numba if available, otherwise return None."""
+    if njit is None:
+        return None
+    return njit(cache=True)(func)
+
+
+def temperatures(ITERA, T, anneal=False, T0=None, Tf=None):
+    """
+    Effective temperature of every sweep, same schedule as the Python loops:
+    constant T, or exponential decay from T0 (default T) to Tf (default 0.1*T0).
+    """
+    if not anneal:
+        return np.full(ITERA, float(T))
+    if T0 is None:
+        T0 = T
+    if Tf is None:
+        Tf = 0.1 * T0
+    sweeps = np.arange(ITERA)
+    return T0 * ((Tf / T0) ** (sweeps / max(1, ITERA - 1)))
+
+
+def _seed(seed):
+    np.random.seed(seed)
+
+
+_seed_jit = None if njit is None else njit(_seed)
+
+
+def seed_jit(seed):
+    """
+    Seed the RNG used inside the compiled kernels.
+    Numba keeps its own generator, independent of np.random and random.
+    """
+    if _seed_jit is not None:
+        _seed_jit(seed)
+
+
+def run_blocks(kernel, temps, Sample, recorder=None):
+    """
+    Run a compiled sweep kernel over the temperature schedule.
+
+    kernel(temps) performs len(temps) sweeps in place on Sample. With a
+    recorder the schedule is split into blocks of recorder.every sweeps and
+    a snapshot is appended after each complete block, matching the Python loops.
+    """
+    if recorder is None:
+        kernel(temps)
+        return
+    ITERA = temps.shape[0]
+    for start in range(0, ITERA, recorder.every):
+        end = min(start + recorder.every, ITERA)
+        kernel(temps[start:end])
+        if end % recorder.every == 0:
+            recorder.append(end, Sample)
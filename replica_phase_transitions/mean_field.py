@@ -0,0 +1,210 @@
+import warnings
+import numpy as np
+
+
+#Mean-field theory of the denoising posterior used by the samplers:
+#
+#    P(X|Y) ∝ exp( -(1/T) Σ_k [ α X_k + β X_k Σ_{n∈N(k)} X_n - λ Y_k X_k ] )
+#
+#with z neighbours per site. The clean image is treated as locally uniform
+#(inside a domain of true sign s ∈ {+1,-1}, all neighbours share s), and the
+#observation Y_k is produced from s by one of two channels:
+#    "flip"     : Y = s with probability 1-p, -s with probability p (add_noise)
+#    "gaussian" : Y = s + sqrt(Δ) ξ,  ξ ~ N(0,1)                     (Exercise1)
+#
+#Every site in a domain then sees a random field h = (λY - α)/T and the
+#coupling K = -β/T to its neighbours (K > 0 is ferromagnetic). The field
+#average is a two-point sum for "flip" and a Gauss-Hermite quadrature for
+#"gaussian"; the magnetization m(h) is kept on the quadrature nodes.
+#
+#Three fixed-point iterations are available:
+#    "mf"  : naive (Curie-Weiss) mean field
+#                m^{t+1}(h) = tanh( h + z K m̄^t )
+#    "bethe": Bethe-lattice cavity recursion. Each of the z neighbours sends
+#            a cavity bias u; the incoming biases are replaced by their field
+#            average (a single message, no population dynamics), so this is
+#            not the full replica-symmetric solution:
+#                u^{t+1} = E_h[ atanh( tanh K tanh( h + (z-1) u^t ) ) ]
+#                m(h)    = tanh( h + z u )
+#    "tap" : field-resolved TAP equations iterated AMP-style, the Onsager
+#            reaction term using the previous iterate
+#                m^{t+1}(h) = tanh( h + z K m̄^t - z K² (1 - Q^t) m^{t-1}(h) )
+#where m̄ = E_h[m(h)] and Q = E_h[m(h)²] are averages within the domain.
+#The Onsager term is a small-coupling expansion: when z K² is of order one
+#or larger "tap" oscillates instead of converging. Grid points that do not
+#converge are reported in result["converged"] and trigger a warning.
+#
+#None of them is an (m, q) state-evolution recursion: they are mean-field
+#approximations of the lattice posterior, whose loops the replica / AMP
+#analysis of the exercises does not describe.
+#
+#All parameters broadcast against each other, so a whole grid of
+#(noise, Beta, lam, T) points is solved in one vectorized iteration.
+
+
+def _fields(noise, lam, alpha, T, channel, n_quad):
+    """
+    Quadrature of the site field for both truth signs.
+
+    Returns (h, y, w, s): h has shape grid + (2, n), y the observation on
+    each node, w the matching weights and s = [+1, -1] the truth sign of each row.
+    """
+    s = np.array([1.0, -1.0])[:, None]
+    noise = np.asarray(noise, dtype=float)[..., None, None]
+    lam = np.asarray(lam, dtype=float)[..., None, None]
+    alpha = np.asarray(alpha, dtype=float)[..., None, None]
+    T = np.asarray(T, dtype=float)[..., None, None]
+
+    if channel == "flip":
+        # y = s (prob 1-p) or -s (prob p)
+        y = s * np.array([1.0, -1.0])
+        w = np.concatenate([1.0 - noise, noise], axis=-1)
+    elif channel == "gaussian":
+        # probabilists' Hermite nodes: E[f(ξ)] ≈ Σ w_i f(ξ_i) / sqrt(2π)
+        xi, wq = np.polynomial.hermite_e.hermegauss(n_quad)
+        y = s + np.sqrt(noise) * xi
+        w = np.broadcast_to(wq / np.sqrt(2.0 * np.pi), y.shape)
+    else:
+        raise ValueError(f"Unknown channel {channel!r}, expected 'flip' or 'gaussian'")
+
+    h = (lam * y - alpha) / T
+    return h, y, w, s
+
+
+def solve(noise, Beta, lam, T=1.0, alpha=0.0, z=4, channel="flip", method="bethe",
+          rho=0.5, damping=0.5, tol=1e-10, max_iter=5000, n_quad=41, init="observed"):
+    """
+    Solve the mean-field, Bethe cavity or TAP fixed point on a grid of parameters.
+
+    Parameters
+    ----------
+    noise : float or array
+        Flip probability p ("flip") or noise variance Δ ("gaussian").
+
+    Beta : float or array
+        Coupling constant, same convention as the samplers (β < 0 aligns).
+
+    lam : float or array
+        Data fidelity strength λ.
+
+    T : float or array
+        Temperature.
+
+    alpha : float or array
+        External field term α.
+
+    z : int
+        Number of neighbours (4 for Gibbs/Metropolis, 8 with diagonals).
+
+    channel : {"flip", "gaussian"}
+        Noise model producing Yobs from the clean image.
+
+    method : {"mf", "bethe", "tap"}
+        Naive mean field, Bethe cavity recursion with field-averaged
+        messages or TAP equations with the Onsager term (see the module header).
+
+    rho : float
+        Fraction of +1 pixels in the clean image.
+
+    damping : float in [0, 1)
+        x ← damping * x_old + (1 - damping) * x_new at every iteration
+        (x = m, or the cavity bias u for "bethe").
+
+    tol : float
+        Convergence threshold on max |x_new - x_old| for each grid point.
+
+    max_iter : int
+        Maximum number of iterations.
+
+    n_quad : int
+        Number of Gauss-Hermite nodes (only used by "gaussian").
+
+    init : {"observed", "informed", "random"}
+        Start from m = sign(Y) (as the samplers, initialized at the noisy
+        image), from the truth m = s, or from a small random magnetization.
+
+    Returns
+    -------
+    result : dict of arrays with the broadcast grid shape
+        "m"        : (grid, 2) magnetization in the +1 and -1 domains.
+        "overlap"  : q = E_s[ s m̄_s ], overlap of a posterior sample with the truth.
+        "mismatch" : (1 - q) / 2, fraction of wrong pixels in a posterior sample.
+        "error"    : sqrt(mismatch), the relative error printed by phasetransition.py.
+        "mismatch_map" : wrong pixels of the marginal estimate sign(m(h)).
+        "iterations", "converged" : iterations used and convergence mask;
+            values at non-converged points are not fixed points.
+    """
+    if method not in ("mf", "bethe", "tap"):
+        raise ValueError(f"Unknown method {method!r}, expected 'mf', 'bethe' or 'tap'")
+    if not 0.0 <= damping < 1.0:
+        raise ValueError("damping must be in [0, 1)")
+
+    h, y, w, s = _fields(noise, lam, alpha, T, channel, n_quad)
+    K = (-np.asarray(Beta, dtype=float) / np.asarray(T, dtype=float))[..., None, None]
+    shape = np.broadcast_shapes(h.shape, w.shape, K.shape)
+    h = np.broadcast_to(h, shape)
+    w = np.broadcast_to(w, shape)
+
+    if init == "observed":
+        m = np.broadcast_to(np.sign(y), shape).copy()
+    elif init == "informed":
+        m = np.broadcast_to(s, shape).copy()
+    elif init == "random":
+        m = 0.01 * np.random.randn(*shape)
+    else:
+        raise ValueError(f"Unknown init {init!r}, expected 'observed', 'informed' or 'random'")
+
+    if method == "bethe":
+        # cavity bias of a neighbour with magnetization m̄, clipped to keep atanh finite
+        t = np.clip(np.tanh(K) * np.sum(w * m, axis=-1, keepdims=True), -1 + 1e-15, 1 - 1e-15)
+        x = np.arctanh(t)
+    else:
+        x = m
+    x_prev = x.copy()
+
+    grid = shape[:-2]
+    converged = np.zeros(grid, dtype=bool)
+    iterations = np.zeros(grid, dtype=int)
+
+    for it in range(1, max_iter + 1):
+        if method == "bethe":
+            t = np.tanh(K) * np.tanh(h + (z - 1) * x)
+            x_new = np.sum(w * np.arctanh(np.clip(t, -1 + 1e-15, 1 - 1e-15)), axis=-1, keepdims=True)
+        else:
+            field = h + z * K * np.sum(w * x, axis=-1, keepdims=True)
+            if method == "tap":
+                Q = np.sum(w * x ** 2, axis=-1, keepdims=True)
+                field = field - z * K ** 2 * (1.0 - Q) * x_prev
+            x_new = np.tanh(field)
+        x_new = damping * x + (1.0 - damping) * x_new
+
+        # grid points that already converged are frozen
+        frozen = converged[..., None, None]
+        delta = np.max(np.abs(x_new - x), axis=(-2, -1))
+        iterations[~converged] = it
+        converged |= delta < tol
+        x_prev = np.where(frozen, x_prev, x)
+        x = np.where(frozen, x, x_new)
+        if converged.all():
+            break
+
+    if not converged.all():
+        warnings.warn(f"{int((~converged).sum())} of {converged.size} grid point(s) did not converge "
+                      f"after {max_iter} iterations (method={method!r}).", stacklevel=2)
+
+    m = np.tanh(h + z * x) if method == "bethe" else x
+
+    prior = np.array([rho, 1.0 - rho])
+    m_dom = np.sum(w * m, axis=-1)
+    overlap = np.sum(prior * s[:, 0] * m_dom, axis=-1)
+    mismatch = 0.5 * (1.0 - overlap)
+    wrong_map = np.sum(w * (np.sign(m) != s), axis=-1)
+    return {
+        "m": m_dom,
+        "overlap": overlap,
+        "mismatch": mismatch,
+        "error": np.sqrt(np.clip(mismatch, 0.0, None)),
+        "mismatch_map": np.sum(prior * wrong_map, axis=-1),
+        "iterations": iterations,
+        "converged": converged,
+    }
@@ -7,6 +7,7 @@ from Isotropic.Metropolis import Metropolis
 from Isotropic.Gibbs import Gibbs
 from Anisotropic.AMetropolis import AMetropolis
 from Anisotropic.AGibbs import AGibbs
+from replica_phase_transitions.mean_field import solve
 
 
 #convert an image to a binary matrix debending otn the specified threshold
@@ -85,13 +86,25 @@ noises = np.arange(0,1,0.03)
 Results_n =[]
 for noise in noises:
     Sample_n = add_noise(Sample.copy(),noise)
-    X=Metropolis(Sample_n,height,width,ITERA,Alpha,Beta,T, lam=0.05, T0=0.5,Tf=0.01,anneal=False)
+    Yobs = Sample_n.copy() #data term attracts the spins to the noisy image, as in the theory below
+    X=Metropolis(Sample_n,height,width,ITERA,Alpha,Beta,T,Yobs=Yobs, lam=0.05, T0=0.5,Tf=0.01,anneal=False)
     Result = np.linalg.norm(X-Z,"fro")/(norm*2)
     print(noise,Result)
     Results_n.append(Result)
 
+#mean-field prediction on the same noise grid (seconds instead of one MCMC run per point)
+#(TAP is not drawn: with T=0.1, Beta=-0.8 its Onsager expansion is far outside its range)
+def theory(method):
+    res = solve(noises, Beta, 0.05, T=T, alpha=Alpha, method=method)
+    return np.where(res["converged"], res["error"], np.nan) #no curve where there is no fixed point
+Theory_mf = theory("mf")
+Theory_bethe = theory("bethe")
+
 plt.figure()
-plt.plot(noises,Results_n)
+plt.plot(noises,Results_n,label="Metropolis")
+plt.plot(noises,Theory_mf,"--",label="naive mean field")
+plt.plot(noises,Theory_bethe,":",label="Bethe cavity")
+plt.legend()
 plt.title("Denoising error with variable noise")
 plt.xlabel("p(flip)")
 plt.ylabel("relative error")
@@ -0,0 +1,290 @@
+import warnings
+import numpy as np
+from stencil import isotropic_kernel
+
+
+#Histogram reweighting for the isotropic samplers (Gibbs, Metropolis).
+#
+#Their stationary distribution is exp(-E/T) with
+#    E(X) = α M + β B - λ D,
+#    M = Σ_k X_k,   B = Σ_<ij> X_i X_j,   D = Σ_k Y_k X_k,
+#so (M, B, D) are sufficient statistics: two configurations with the same
+#(M, B, D) have the same weight at every (α, β, λ, T). A run at reference
+#parameters therefore predicts averages at nearby parameters by reweighting
+#its joint histogram of (M, B, D) (single histogram), and several runs are
+#combined with the multiple-histogram / WHAM equations.
+
+
+class HistogramRecorder:
+    """
+    Records the sufficient statistics (M, B, D) during a sampler run.
+
+    Pass it as the recorder of Gibbs or Metropolis: every `every` sweeps
+    after `burn_in` the statistics of Sample (and optional observables) are
+    stored. Only equilibrium runs at fixed T can be reweighted: the samplers
+    refuse anneal=True with this recorder, as well as anisotropic kernels and
+    parameters or Yobs different from the recorder's (see check_run).
+
+    Parameters
+    ----------
+    height, width : int
+        True image dimensions (without border).
+
+    alpha, Beta, lam, T : float
+        Parameters of the run (the reference point of the histogram).
+
+    Yobs : 1D numpy array, optional
+        Observed image passed to the sampler. If None (prior-only run)
+        D is recorded as 0, which requires lam=0: with Yobs=None and lam != 0
+        the sampler attracts the spins to their own current values and the
+        chain is not distributed as exp(-E/T).
+
+    every : int
+        Record every `every` sweeps.
+
+    burn_in : int
+        Sweeps discarded before recording starts.
+
+    observables : dict, optional
+        name -> f(X) with X the 2D interior configuration, returning a float
+        (e.g. the error with respect to the clean image).
+    """
+
+    def __init__(self, height, width, alpha, Beta, lam, T, Yobs=None,
+                 every=1, burn_in=0, observables=None):
+        if Yobs is None and lam != 0:
+            raise ValueError("Yobs=None with lam != 0 cannot be reweighted, pass Yobs or lam=0")
+        self.height = height
+        self.width = width
+        self.alpha = alpha
+        self.Beta = Beta
+        self.lam = lam
+        self.T = T
+        self.every = every
+        self.burn_in = burn_in
+        self.observables = dict(observables or {})
+        if Yobs is None:
+            self.Y = np.zeros((height + 2, width + 2))
+        else:
+            self.Y = np.asarray(Yobs, dtype=float).reshape(height + 2, width + 2)
+        self._stats = []
+        self._obs = []
+
+    def check_run(self, kernel, alpha, T, lam, Yobs, anneal):
+        """
+        Called by the samplers before the run: the recorded (M, B, D) are
+        sufficient statistics only for an equilibrium run of the isotropic
+        kernel at this recorder's reference point.
+        """
+        if anneal:
+            raise ValueError("HistogramRecorder needs an equilibrium run at fixed T, use anneal=False")
+        if kernel.shape != (3, 3) or not np.allclose(kernel, isotropic_kernel(self.Beta)):
+            raise ValueError("HistogramRecorder only supports the isotropic kernel with its own Beta "
+                             "(Gibbs / Metropolis)")
+        if not np.allclose((alpha, T, lam), (self.alpha, self.T, self.lam)):
+            raise ValueError(f"sampler parameters (alpha, T, lam) = {(alpha, T, lam)} differ from the "
+                             f"recorder's {(self.alpha, self.T, self.lam)}")
+        Y = np.zeros_like(self.Y) if Yobs is None else np.asarray(Yobs, dtype=float).reshape(self.Y.shape)
+        if not np.array_equal(Y, self.Y):
+            raise ValueError("sampler and recorder must use the same Yobs")
+
+    def append(self, sweep, Sample):
+        if sweep <= self.burn_in:
+            return
+        X = np.asarray(Sample, dtype=float).reshape(self.height + 2, self.width + 2)
+        # the border is 0, so it adds nothing to the sums
+        M = X.sum()
+        B = (X[:, :-1] * X[:, 1:]).sum() + (X[:-1, :] * X[1:, :]).sum()
+        D = (self.Y * X).sum()
+        self._stats.append((M, B, D))
+        inner = X[1:-1, 1:-1]
+        self._obs.append([f(inner) for f in self.observables.values()])
+
+    def __len__(self):
+        return len(self._stats)
+
+    @property
+    def stats(self):
+        """(n, 3) array of recorded (M, B, D)."""
+        return np.array(self._stats, dtype=float).reshape(-1, 3)
+
+    def histogram(self):
+        """
+        Joint histogram of (M, B, D).
+
+        Returns (bins, counts): bins is (n_bins, 3), counts (n_bins,).
+        """
+        bins, counts = np.unique(self.stats, axis=0, return_counts=True)
+        return bins, counts
+
+
+def _logsumexp(a, axis):
+    a_max = np.max(a, axis=axis, keepdims=True)
+    a_max = np.where(np.isfinite(a_max), a_max, 0.0)
+    with np.errstate(divide="ignore"):
+        out = np.log(np.sum(np.exp(a - a_max), axis=axis, keepdims=True)) + a_max
+    return np.squeeze(out, axis=axis)
+
+
+def _reduced_energy(bins, alpha, Beta, lam, T):
+    """(E / T) of each bin, broadcast over parameter arrays (leading axes)."""
+    p = [np.asarray(v, dtype=float)[..., None] for v in (alpha, Beta, lam, T)]
+    return (p[0] * bins[:, 0] + p[1] * bins[:, 1] - p[2] * bins[:, 2]) / p[3]
+
+
+def _wham(counts, u, tol, max_iter):
+    """
+    Solve the WHAM equations.
+
+    counts : (K, n_bins) histogram of each run.
+    u      : (K, n_bins) reduced energy of each bin at each run's parameters.
+    Returns log Ω (n_bins,), the log density of states up to a constant.
+    """
+    n = counts.sum(axis=1)
+    with np.errstate(divide="ignore"):
+        log_N = np.log(counts.sum(axis=0))
+        log_n = np.log(n)[:, None]
+    f = np.zeros(counts.shape[0])
+    for _ in range(max_iter):
+        log_omega = log_N - _logsumexp(log_n + f[:, None] - u, axis=0)
+        f_new = -_logsumexp(log_omega - u, axis=1)
+        f_new -= f_new[0]
+        if np.max(np.abs(f_new - f)) < tol:
+            f = f_new
+            break
+        f = f_new
+    else:
+        warnings.warn(f"WHAM free energies did not converge after {max_iter} iterations.", stacklevel=3)
+    return log_N - _logsumexp(log_n + f[:, None] - u, axis=0)
+
+
+def _estimate(bins, counts, obs_sum, u_runs, targets, N):
+    """Reweighted averages and effective sample size at every target."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_omega = _wham(counts, u_runs, 1e-10, 10000)
+        total = counts.sum(axis=0)
+        obs_mean = np.where(total[:, None] > 0, obs_sum / total[:, None], 0.0)
+
+    u_t = _reduced_energy(bins, *targets)
+    log_w = log_omega - u_t
+    log_w = log_w - np.max(log_w, axis=-1, keepdims=True)
+    w = np.exp(log_w)
+    w = w / w.sum(axis=-1, keepdims=True)
+
+    alpha, Beta, lam, T = (np.asarray(v, dtype=float)[..., None] for v in targets)
+    E = alpha * bins[:, 0] + Beta * bins[:, 1] - lam * bins[:, 2]
+    columns = {
+        "magnetization": np.broadcast_to(bins[:, 0] / N, w.shape),
+        "interaction": np.broadcast_to(bins[:, 1] / N, w.shape),
+        "data": np.broadcast_to(bins[:, 2] / N, w.shape),
+        "energy": np.broadcast_to(E / N, w.shape),
+    }
+    means = {name: np.sum(w * col, axis=-1) for name, col in columns.items()}
+    means["energy_sq"] = np.sum(w * columns["energy"] ** 2, axis=-1)
+    extra = np.tensordot(w, obs_mean, axes=([-1], [0]))
+
+    # per-sample weights are w_b / N_b, ESS = (Σ_b w_b)² / Σ_b w_b² / N_b
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ess = 1.0 / np.sum(np.where(total > 0, w ** 2 / total, 0.0), axis=-1)
+    return means, extra, ess
+
+
+def reweight(recorders, alpha=None, Beta=None, lam=None, T=None,
+             n_blocks=10, min_ess=50):
+    """
+    Estimate averages at new parameters from one or more recorded runs.
+
+    With one recorder this is single-histogram reweighting, with several
+    (different reference points, same image and Yobs) the histograms are
+    combined with the multiple-histogram (WHAM) equations.
+
+    Parameters
+    ----------
+    recorders : HistogramRecorder or list of HistogramRecorder
+        Recorded equilibrium runs.
+
+    alpha, Beta, lam, T : float or array, optional
+        Target parameters; arrays broadcast against each other, so a whole
+        curve is estimated at once. Each defaults to the first run's value.
+
+    n_blocks : int
+        Every run is cut into n_blocks consecutive blocks for the jackknife
+        error estimate (blocks should be longer than the autocorrelation time).
+
+    min_ess : float
+        A warning is issued for targets whose effective sample size is below
+        this value (extrapolation outside the sampled region). The sample
+        size is divided by the integrated autocorrelation time of the energy
+        estimated from the blocks, so correlated sweeps are not counted as
+        independent.
+
+    Returns
+    -------
+    result : dict
+        "mean", "error" : dicts name -> array over the target grid with
+            "magnetization", "interaction", "data", "energy" (per site),
+            "specific_heat" (per site) and every recorded observable.
+        "ess" : effective number of independent samples at each target.
+        "tau" : integrated autocorrelation time (in records) of the energy,
+            largest over the runs.
+    """
+    if isinstance(recorders, HistogramRecorder):
+        recorders = [recorders]
+    ref = recorders[0]
+    for r in recorders:
+        if (r.height, r.width) != (ref.height, ref.width) or r.observables.keys() != ref.observables.keys():
+            raise ValueError("all runs must share the image size and the recorded observables")
+        if len(r) < n_blocks:
+            raise ValueError(f"run with {len(r)} records cannot be cut into {n_blocks} blocks")
+    N = ref.height * ref.width
+    targets = tuple(ref_v if v is None else v for v, ref_v in
+                    zip((alpha, Beta, lam, T), (ref.alpha, ref.Beta, ref.lam, ref.T)))
+    names = list(ref.observables)
+
+    # common bins over all runs, with run and block label of every record
+    stats = np.concatenate([r.stats for r in recorders])
+    obs = np.concatenate([np.array(r._obs, dtype=float).reshape(len(r), len(names)) for r in recorders])
+    run = np.concatenate([np.full(len(r), k) for k, r in enumerate(recorders)])
+    block = np.concatenate([np.arange(len(r)) * n_blocks // len(r) for r in recorders])
+    bins, inverse = np.unique(stats, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+    nb = len(bins)
+    K = len(recorders)
+    u_runs = np.stack([_reduced_energy(bins, r.alpha, r.Beta, r.lam, r.T) for r in recorders])
+
+    def estimate(keep):
+        counts = np.zeros((K, nb))
+        np.add.at(counts, (run[keep], inverse[keep]), 1.0)
+        obs_sum = np.zeros((nb, len(names)))
+        np.add.at(obs_sum, inverse[keep], obs[keep])
+        means, extra, ess = _estimate(bins, counts, obs_sum, u_runs, targets, N)
+        T_t = np.asarray(targets[3], dtype=float)
+        means["specific_heat"] = N * (means.pop("energy_sq") - means["energy"] ** 2) / T_t ** 2
+        for i, name in enumerate(names):
+            means[name] = extra[..., i]
+        return means, ess
+
+    mean, ess = estimate(np.ones(len(stats), dtype=bool))
+
+    # τ_int ≈ n_per_block * var(block means) / var(records), for each run
+    tau = 1.0
+    for k in range(K):
+        u = u_runs[k, inverse[run == k]]
+        if u.var() > 0:
+            block_means = np.array([u[block[run == k] == j].mean() for j in range(n_blocks)])
+            tau = max(tau, len(u) / n_blocks * block_means.var(ddof=1) / u.var())
+    ess = ess / tau
+
+    # leave-one-block-out jackknife
+    jack = [estimate(block != j)[0] for j in range(n_blocks)]
+    error = {}
+    for name in mean:
+        values = np.stack([j[name] for j in jack])
+        error[name] = np.sqrt((n_blocks - 1) / n_blocks * np.sum((values - values.mean(axis=0)) ** 2, axis=0))
+
+    low = np.asarray(ess < min_ess)
+    if low.any():
+        warnings.warn(f"{int(low.sum())} target point(s) have fewer than {min_ess} effective samples: "
+                      "extrapolating outside the sampled region, add a run closer to them.",
+                      stacklevel=2)
+    return {"mean": mean, "error": error, "ess": ess, "tau": tau}
@@ -0,0 +1,342 @@
+import random
+import warnings
+import numpy as np
+from jit_backend import check_backend, jit, run_blocks, temperatures, use_jit
+
+
+#Generic engine behind Gibbs, Metropolis, AGibbs and AMetropolis.
+#
+#The interaction is a coupling kernel: a small 2D array of odd size whose
+#entry K[a, b] is the coupling between a site and its neighbour at offset
+#(a - ry, b - rx), with (ry, rx) the kernel centre. The energy is
+#    E(X|Y) = Σ_k [ α X_k + X_k Σ_d K[d] X_{k+d} - λ Y_k X_k ]
+#and the conditional of one site depends on its local field
+#    h_k = α + Σ_d K[d] X_{k+d} - λ Y_k.
+#
+#Two scans are available:
+#    "random" : one site at a time in a shuffled order (the reference
+#               random-scan semantics), pure Python or compiled with Numba.
+#    "colour" : the lattice is split into colour classes of mutually
+#               non-interacting sites, derived from the kernel support, and
+#               each class is updated at once from vectorized local fields
+#               gathered for that class only (a weighted sum of the
+#               neighbours at every kernel offset).
+
+
+def isotropic_kernel(Beta):
+    """4-neighbour kernel of Gibbs / Metropolis."""
+    return np.array([[0.0, Beta, 0.0],
+                     [Beta, 0.0, Beta],
+                     [0.0, Beta, 0.0]])
+
+
+def anisotropic_kernel(Beta_h, Beta_v, Beta_d1, Beta_d2):
+    """8-neighbour kernel of AGibbs / AMetropolis (d1: ↖↘, d2: ↗↙)."""
+    return np.array([[Beta_d1, Beta_v, Beta_d2],
+                     [Beta_h, 0.0, Beta_h],
+                     [Beta_d2, Beta_v, Beta_d1]])
+
+
+def random_sample(height, width):
+    """Random ±1 configuration with a zero 1-pixel border, the layout of img_to_matrix."""
+    sample = np.zeros((height + 2) * (width + 2))
+    sample.reshape(height + 2, width + 2)[1:-1, 1:-1] = np.random.choice([-1.0, 1.0], size=(height, width))
+    return sample
+
+
+def _check_kernel(kernel):
+    kernel = np.asarray(kernel, dtype=float)
+    if kernel.ndim != 2 or kernel.shape[0] % 2 == 0 or kernel.shape[1] % 2 == 0:
+        raise ValueError("kernel must be a 2D array with odd sizes")
+    ry, rx = kernel.shape[0] // 2, kernel.shape[1] // 2
+    if kernel[ry, rx] != 0:
+        raise ValueError("kernel centre (self-coupling) must be 0")
+    if not np.allclose(kernel, kernel[::-1, ::-1]):
+        raise ValueError("kernel must be symmetric, K[d] == K[-d]")
+    return kernel
+
+
+def _support(kernel):
+    """Offsets (di, dj) of the non-zero couplings."""
+    ry, rx = kernel.shape[0] // 2, kernel.shape[1] // 2
+    a, b = np.nonzero(kernel)
+    return a - ry, b - rx
+
+
+def colouring(kernel):
+    """
+    Independent-set colouring of the lattice for this kernel.
+
+    Looks for the smallest m (then a, b) such that the linear colouring
+        colour(i, j) = (a*i + b*j) mod m
+    never gives the same colour to two sites coupled by the kernel, i.e.
+    (a*di + b*dj) mod m != 0 for every offset in the support.
+    The 4-neighbour kernel gives the checkerboard (1, 1, 2), the full 3x3
+    kernel four colours. A solution always exists for m = (2r+1)².
+
+    Returns (a, b, m).
+    """
+    kernel = _check_kernel(kernel)
+    di, dj = _support(kernel)
+    if di.size == 0:
+        return 0, 0, 1
+    m = 2
+    while True:
+        for a in range(m):
+            for b in range(m):
+                if np.all((a * di + b * dj) % m != 0):
+                    return a, b, m
+        m += 1
+
+
+def StencilSampler(Sample, height, width, ITERA, kernel, alpha, T,
+                   Yobs=None, lam=0.0, anneal=False, T0=None, Tf=None,
+                   method="gibbs", scan="random", backend="python", recorder=None, caller=None):
+    """
+    Gibbs or Metropolis sampler for an arbitrary coupling kernel.
+
+    Parameters
+    ----------
+    Sample : 1D numpy array
+        Current spin configuration (±1) including a 1-pixel border.
+        Updated in place. Offsets reaching beyond the border see 0.
+
+    height, width : int
+        True image dimensions (without border).
+
+    ITERA : int
+        Number of full sweeps.
+
+    kernel : 2D array
+        Symmetric coupling kernel of odd size with zero centre
+        (see isotropic_kernel / anisotropic_kernel). Negative entries
+        encourage alignment.
+
+    alpha : float
+        External field term.
+
+    T : float
+        Base temperature (used if anneal=False).
+
+    Yobs : 1D numpy array, optional
+        Observed noisy image in {-1,+1}, same layout as Sample.
+        If None, Sample itself is used (prior-only behaviour).
+
+    lam : float
+        Data fidelity strength λ.
+
+    anneal : bool
+        Exponential temperature decay from T0 (default T) to Tf (default 0.1*T0).
+
+    method : {"gibbs", "metropolis"}
+        Heat-bath resampling or single spin-flip Metropolis acceptance.
+
+    scan : {"random", "colour"}
+        Shuffled single-site sweeps, or parallel updates of one colour class
+        at a time (each sweep visits every class once).
+
+    backend : {"python", "numba"}
+        Used by scan="random" only, see jit_backend. The colour scan is
+        vectorized numpy and warns if backend="numba" is requested.
+
+    recorder : TrajectoryRecorder or HistogramRecorder, optional
+        Receives Sample every recorder.every sweeps, and also before the
+        first sweep if recorder.initial and after the last one if
+        recorder.final is set (TrajectoryRecorder). A recorder with a
+        check_run method validates the run first (HistogramRecorder accepts
+        only the isotropic kernel at its own parameters).
+
+    caller : str, optional
+        Name of the wrapper calling StencilSampler (Gibbs, AGibbs, ...).
+        Warnings then name it and point at the wrapper's caller.
+
+    Returns
+    -------
+    Out_inner : 2D numpy array (height, width)
+        Final configuration (no padding).
+    """
+    if method not in ("gibbs", "metropolis"):
+        raise ValueError(f"Unknown method {method!r}, expected 'gibbs' or 'metropolis'")
+    if scan not in ("random", "colour"):
+        raise ValueError(f"Unknown scan {scan!r}, expected 'random' or 'colour'")
+    kernel = _check_kernel(kernel)
+    check_backend(backend)
+    # warnings point at the user's call, one frame up when called from a wrapper
+    stacklevel = 2 if caller is None else 3
+    if scan == "colour" and backend == "numba":
+        warnings.warn("backend='numba' has no effect with scan='colour', running the numpy colour sweeps.",
+                      stacklevel=stacklevel)
+    jitted = scan == "random" and use_jit(backend, caller or "StencilSampler", stacklevel + 1)
+    r = max(1, kernel.shape[0] // 2, kernel.shape[1] // 2)
+    H = height + 2 * r
+    W = width + 2 * r
+
+    if hasattr(recorder, "check_run"):
+        recorder.check_run(kernel, alpha, T, lam, Yobs, anneal)
+    if anneal:
+        if T0 is None:
+            T0 = T
+        if Tf is None:
+            Tf = 0.1 * T0
+    temps = temperatures(ITERA, T, anneal, T0, Tf)
+
+    # Work on a lattice padded by the kernel radius. For r = 1 this is a
+    # view of Sample itself, otherwise a copy written back before recording.
+    if r == 1:
+        X = Sample.reshape(H, W)
+        Y = X if Yobs is None else np.asarray(Yobs).reshape(H, W)
+    else:
+        X = np.zeros((H, W), dtype=Sample.dtype)
+        X[r - 1:r + height + 1, r - 1:r + width + 1] = Sample.reshape(height + 2, width + 2)
+        if Yobs is None:
+            Y = X
+        else:
+            Y = np.zeros((H, W))
+            Y[r - 1:r + height + 1, r - 1:r + width + 1] = np.asarray(Yobs).reshape(height + 2, width + 2)
+
+    def sync():
+        if r > 1:
+            Sample.reshape(height + 2, width + 2)[1:-1, 1:-1] = X[r:r + height, r:r + width]
+
+    if getattr(recorder, "initial", False):
+        recorder.append(0, Sample)
+
+    if scan == "colour":
+        _colour_sweeps(X, Y, kernel, r, height, width, temps, alpha, lam, method, recorder, Sample, sync)
+    else:
+        _random_sweeps(X, Y, kernel, r, height, width, temps, alpha, lam, method, jitted, recorder, Sample, sync)
+
+    sync()
+    if getattr(recorder, "final", False) and ITERA % recorder.every:
+        recorder.append(ITERA, Sample)
+    return X[r:r + height, r:r + width].astype(float)
+
+
+def _random_sweeps(X, Y, kernel, r, height, width, temps, alpha, lam, method, jitted, recorder, Sample, sync):
+    W = width + 2 * r
+    di, dj = _support(kernel)
+    offsets = di * W + dj
+    weights = kernel[di + kernel.shape[0] // 2, dj + kernel.shape[1] // 2]
+    Xf = X.reshape(-1)
+    Yf = Y.reshape(-1)
+
+    # interior indices (skip padded border)
+    rows, cols = np.mgrid[r:r + height, r:r + width]
+    indices = (rows * W + cols).ravel()
+
+    if jitted:
+        sweeps_jit = _gibbs_sweeps_jit if method == "gibbs" else _metropolis_sweeps_jit
+
+        def kernel_blocks(block):
+            sweeps_jit(Xf, Yf, indices, block, offsets, weights, alpha, lam)
+            sync()
+
+        run_blocks(kernel_blocks, temps, Sample, recorder)
+        return
+
+    neighbours = list(zip(offsets.tolist(), weights.tolist()))
+    for sweep, T_eff in enumerate(temps):
+        np.random.shuffle(indices)
+
+        for k in indices:
+            nb = 0.0
+            for o, w in neighbours:
+                nb += w * Xf[k + o]
+            h_loc = alpha + nb - lam * Yf[k]
+
+            if method == "gibbs":
+                # p(X_k = +1) = 1 / (1 + exp(2 h / T))
+                p_plus = 1.0 / (1.0 + np.exp(2.0 * h_loc / T_eff))
+                Xf[k] = 1 if random.random() < p_plus else -1
+            else:
+                # flip s -> -s changes the energy by -2 s h
+                s = Xf[k]
+                dE = -2.0 * s * h_loc
+                if dE <= 0 or random.random() < np.exp(-dE / T_eff):
+                    Xf[k] = -s
+
+        if recorder is not None and (sweep + 1) % recorder.every == 0:
+            sync()
+            recorder.append(sweep + 1, Sample)
+
+
+def _colour_sweeps(X, Y, kernel, r, height, width, temps, alpha, lam, method, recorder, Sample, sync):
+    W = width + 2 * r
+    di, dj = _support(kernel)
+    offsets = di * W + dj
+    weights = kernel[di + kernel.shape[0] // 2, dj + kernel.shape[1] // 2]
+    Xf = X.reshape(-1)
+    Yf = Y.reshape(-1)
+
+    # flat indices of the sites of every colour class
+    a, b, m = colouring(kernel)
+    i, j = np.mgrid[0:height, 0:width]
+    colour = ((a * i + b * j) % m).ravel()
+    sites = ((i + r) * W + (j + r)).ravel()
+    classes = [sites[colour == c] for c in range(m)]
+
+    for sweep, T_eff in enumerate(temps):
+        for idx in classes:
+            # sites of one colour do not interact: update them all at once,
+            # gathering the field of this class only (one lattice-wide
+            # evaluation per sweep in total, whatever the number of colours)
+            h_loc = alpha + weights @ Xf[idx[None, :] + offsets[:, None]] - lam * Yf[idx]
+            u = np.random.random(idx.shape)
+            if method == "gibbs":
+                p_plus = 1.0 / (1.0 + np.exp(2.0 * h_loc / T_eff))
+                Xf[idx] = np.where(u < p_plus, 1, -1)
+            else:
+                s = Xf[idx]
+                dE = -2.0 * s * h_loc
+                accept = (dE <= 0) | (u < np.exp(-np.clip(dE, 0, None) / T_eff))
+                Xf[idx] = np.where(accept, -s, s)
+
+        if recorder is not None and (sweep + 1) % recorder.every == 0:
+            sync()
+            recorder.append(sweep + 1, Sample)
+
+
+def _gibbs_sweeps(X, Y, indices, temps, offsets, weights, alpha, lam):
+    """
+    Random-scan heat-bath sweeps for Numba, one per entry of temps.
+    X and Y are the flat padded lattices, updated in place.
+    """
+    for sweep in range(temps.shape[0]):
+        T_eff = temps[sweep]
+        np.random.shuffle(indices)
+
+        for t in range(indices.shape[0]):
+            k = indices[t]
+            nb = 0.0
+            for n in range(offsets.shape[0]):
+                nb += weights[n] * X[k + offsets[n]]
+            h_loc = alpha + nb - lam * Y[k]
+            p_plus = 1.0 / (1.0 + np.exp(2.0 * h_loc / T_eff))
+            X[k] = 1 if np.random.random() < p_plus else -1
+
+
+def _metropolis_sweeps(X, Y, indices, temps, offsets, weights, alpha, lam):
+    """
+    Random-scan single-flip Metropolis sweeps for Numba, one per entry of temps.
+    X and Y are the flat padded lattices, updated in place.
+    """
+    for sweep in range(temps.shape[0]):
+        T_eff = temps[sweep]
+        np.random.shuffle(indices)
+
+        for t in range(indices.shape[0]):
+            k = indices[t]
+            s = X[k]
+            nb = 0.0
+            for n in range(offsets.shape[0]):
+                nb += weights[n] * X[k + offsets[n]]
+            dE = -2.0 * s * (alpha + nb - lam * Y[k])
+
+            if dE <= 0:
+                X[k] = -s
+            elif np.random.random() < np.exp(-dE / T_eff):
+                X[k] = -s
+
+
+_gibbs_sweeps_jit = jit(_gibbs_sweeps)
+_metropolis_sweeps_jit = jit(_metropolis_sweeps)
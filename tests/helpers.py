@@ -0,0 +1,69 @@
+import random
+import numpy as np
+import stencil
+
+
+#Shared lattice, parameters and statistics of the equivalence tests.
+#Independent chains are run with both samplers under comparison, each chain
+#gives time averages of several observables after burn-in, and the means over
+#chains must agree within 4 standard errors.
+
+HEIGHT = 20
+WIDTH = 20
+BURN_IN = 50
+SWEEPS = 250
+CHAINS = 24
+
+Alpha = 0.05
+Beta = -0.3
+T = 1.0
+lam = 0.2
+# strongly different diagonals, so that swapping d1 / d2 (or h / v) is detected
+Beta_h = -0.25
+Beta_v = -0.1
+Beta_d1 = -0.2
+Beta_d2 = 0.05
+
+
+def random_sample(height=HEIGHT, width=WIDTH):
+    return stencil.random_sample(height, width)
+
+
+def seed(n):
+    random.seed(n)
+    np.random.seed(n)
+
+
+def observables(X, Y):
+    """Magnetization, data overlap and the four neighbour correlations."""
+    return (
+        X.mean(),
+        (X * Y).mean(),
+        (X[:, 1:] * X[:, :-1]).mean(),
+        (X[1:, :] * X[:-1, :]).mean(),
+        (X[1:, 1:] * X[:-1, :-1]).mean(),
+        (X[1:, :-1] * X[:-1, 1:]).mean(),
+    )
+
+
+def chain_means(run, Y):
+    """
+    Time averages of the observables after burn-in, one row per chain.
+    run(Sample, Y, ITERA) performs ITERA sweeps in place on Sample.
+    """
+    Yi = Y.reshape(HEIGHT + 2, WIDTH + 2)[1:-1, 1:-1]
+    means = []
+    for _ in range(CHAINS):
+        S = random_sample()
+        run(S, Y, BURN_IN)
+        rows = []
+        for _ in range(SWEEPS // 5):
+            X = run(S, Y, 5)
+            rows.append(observables(X, Yi))
+        means.append(np.mean(rows, axis=0))
+    return np.array(means)
+
+
+def z_scores(a, b):
+    se = np.sqrt(a.var(axis=0, ddof=1) / len(a) + b.var(axis=0, ddof=1) / len(b))
+    return np.abs(a.mean(axis=0) - b.mean(axis=0)) / np.maximum(se, 1e-12)
@@ -0,0 +1,553 @@
+#Original per-sampler loops (before the stencil engine), kept verbatim as the
+#reference that the Gibbs / Metropolis / AGibbs / AMetropolis wrappers are tested against.
+from math import exp
+import random
+import numpy as np
+
+
+def legacy_Gibbs(Sample, height, width, ITERA, alpha, Beta, T,
+          Yobs=None, lam=0.0, anneal=False, T0=None, Tf=None):
+    """
+    Gibbs sampler for binary image denoising via an Ising MRF posterior,
+    with optional simulated annealing.
+
+    Energy convention:
+        E(X|Y) = Σ_k [ α * X_k + β * X_k * Σ_{n∈N(k)} X_n - λ * Y_k * X_k ]
+    and configurations are weighted by exp( -E / T ).
+
+    Notes:
+    - β < 0 encourages alignment (ferromagnetic smoothing).
+    - β > 0 encourages anti-alignment (checkerboard).
+    - λ > 0 enforces similarity with observed data Yobs.
+    - Temperature T controls randomness; lower → more deterministic.
+
+    Annealing:
+    - If anneal=True, temperature decays exponentially from T0 to Tf.
+
+    Arguments
+    ---------
+    Sample : 1D numpy array
+        Current spin configuration (±1) including 1-pixel border.
+        Updated in place.
+
+    height, width : int
+        True image dimensions (without border).
+
+    ITERA : int
+        Number of full sweeps.
+
+    alpha : float
+        External field term.
+
+    Beta : float
+        Coupling constan.
+
+    T : float
+        Base temperature if anneal=False.
+
+    Yobs : 1D numpy array, optional
+        Observed noisy image in {-1,+1}.
+        If None, prior-only sampling (lam=0).
+
+    lam : float
+        Data fidelity parameter (strength of attraction to Yobs).
+
+    anneal : bool
+        Enable simulated annealing (temperature decay).
+
+    T0 : float, optional
+        Starting temperature for annealing (default = T).
+
+    Tf : float, optional
+        Final temperature for annealing (default = 0.1 * T0).
+
+    Returns
+    -------
+    Out_inner : 2D numpy array
+        Final configuration (no padding).
+    """
+
+    H = height + 2
+    W = width + 2
+    Nsites = height * width
+
+    # Fallback for missing observation (pure prior mode)
+    if Yobs is None:
+        Yobs = Sample
+
+    # Setup annealing parameters
+    if anneal:
+        if T0 is None:
+            T0 = T
+        if Tf is None:
+            Tf = 0.1 * T0
+
+    # Precompute linear indices for interior pixels (exclude padded border)
+    indices = np.zeros(Nsites, dtype=int)
+    t = 0
+    for i in range(1, H - 1):
+        base = i * W
+        for j in range(1, W - 1):
+            indices[t] = base + j
+            t += 1
+
+    # Main Gibbs sampling loop
+    for sweep in range(ITERA):
+
+        #Simulated Annealing Schedule
+        if anneal:
+            # Exponential decay from T0 to Tf
+            T_eff = T0 * ((Tf / T0) ** (sweep / max(1, ITERA - 1)))
+        else:
+            T_eff = T
+        np.random.shuffle(indices)
+
+        for k in indices:
+            yk = Yobs[k]
+
+            # 4-neighbour sum (standard Ising coupling)
+            nb_sum = (
+                Sample[k - 1] +
+                Sample[k + 1] +
+                Sample[k - W] +
+                Sample[k + W]
+            )
+
+            # α + β * nb_sum - λ * yk
+            # Negative β favours alignment.
+            h_loc = alpha + Beta * nb_sum - lam * yk
+
+            # Conditional probability for X_k = +1.
+            #   p_plus = 1 / (1 + exp( 2*h_loc / T_eff ))
+            p_plus = 1.0 / (1.0 + np.exp(2.0 * h_loc / T_eff))
+
+            # Draw new spin according to conditional probability.
+            Sample[k] = 1 if random.random() < p_plus else -1
+
+    # Reconstruct 2D array and crop border.
+    Out_full = np.zeros((H, W))
+    for i in range(1, H - 1):
+        base = i * W
+        for j in range(1, W - 1):
+            Out_full[i, j] = Sample[base + j]
+
+    Out_inner = Out_full[1:-1, 1:-1]
+    return Out_inner
+
+
+def legacy_Metropolis(Sample, height, width, ITERA, alpha, Beta, T,
+               Yobs=None, lam=0.0, anneal=False, T0=None, Tf=None):
+    """
+    Metropolis-Hastings sampler for a binary MRF / Ising model with optional simulated annealing.
+
+    Energy convention:
+        H(x) = α * Σ_i x_i
+             + β * Σ_<i,j> x_i x_j
+             - λ * Σ_i y_i x_i
+    and configurations are weighted by exp( -H / T ).
+
+    Interpretation:
+    - β < 0  → alignment / smoothing (ferromagnetic).
+    - β > 0  → anti-alignment (checkerboard).
+    - λ > 0  → agreement with observed data y_i.
+    - T      → temperature; controls acceptance of uphill moves.
+
+    Arguments
+    ---------
+    Sample : 1D numpy array
+        Current configuration (±1 spins) including a 1-pixel border.
+        Updated in place.
+
+    height, width : int
+        True image dimensions excluding border.
+
+    ITERA : int
+        Number of full sweeps.
+
+    alpha : float
+        External field weight.
+
+    Beta : float
+        Coupling constant between neighbours.
+
+    T : float
+        Base temperature (used if anneal=False).
+
+    Yobs : 1D numpy array, optional
+        Observed noisy image in {-1,+1}. If None → prior-only mode.
+
+    lam : float
+        Data fidelity strength λ. Controls adherence to observed data.
+
+    anneal : bool
+        If True, applies exponential temperature decay between T0 and Tf.
+
+    T0 : float, optional
+        Starting temperature for annealing. Defaults to current T.
+
+    Tf : float, optional
+        Final temperature for annealing. Defaults to 0.1 * T0.
+
+    Returns
+    -------
+    Out_inner : 2D numpy array (height, width)
+        Final spins cropped to remove border.
+    """
+
+    H = height + 2
+    W = width + 2
+    Nsites = height * width
+
+    # Fallback: if no observed image, reuse Sample (lam=0 → pure prior)
+    if Yobs is None:
+        Yobs = Sample
+
+    # Annealing setup
+    if anneal:
+        if T0 is None:
+            T0 = T
+        if Tf is None:
+            Tf = 0.1 * T0
+
+    # Interior indices (skip padded border)
+    indices = np.zeros(Nsites, dtype=int)
+    t = 0
+    for i in range(1, H - 1):
+        base = i * W
+        for j in range(1, W - 1):
+            indices[t] = base + j
+            t += 1
+
+    # Main Metropolis loop
+    for sweep in range(ITERA):
+
+        # Simulated Annealing Schedule 
+        if anneal:
+            # Exponential decay of temperature across sweeps
+            T_eff = T0 * ((Tf / T0) ** (sweep / max(1, ITERA - 1)))
+        else:
+            T_eff = T
+
+        np.random.shuffle(indices)
+
+        for k in indices:
+            s = Sample[k]    # current spin (±1)
+            yk = Yobs[k]     # observed pixel (±1)
+
+            # 4-neighbour contribution
+            nb_sum = (
+                Sample[k - 1] +
+                Sample[k + 1] +
+                Sample[k - W] +
+                Sample[k + W]
+            )
+
+            E_cur = alpha * s + Beta * s * nb_sum - lam * yk * s
+            s_new = -s
+            E_new = alpha * s_new + Beta * s_new * nb_sum - lam * yk * s_new
+
+            dE = E_new - E_cur
+
+            # Metropolis acceptance rule
+            if dE <= 0:
+                Sample[k] = s_new
+            else:
+                if random.random() < np.exp(-dE / T_eff):
+                    Sample[k] = s_new
+
+    # Convert back to 2D and remove padding
+    Out_full = np.zeros((H, W))
+    for i in range(1, H - 1):
+        base = i * W
+        for j in range(1, W - 1):
+            Out_full[i, j] = Sample[base + j]
+
+    Out_inner = Out_full[1:-1, 1:-1]
+    return Out_inner
+
+
+def legacy_AGibbs(Sample, height, width, ITERA,
+           alpha, Beta_h, Beta_v, Beta_d1, Beta_d2,
+           T, Yobs=None, lam=0.0, anneal=False, T0=None, Tf=None):
+    """
+    Anisotropic Gibbs sampler for binary image denoising via an Ising MRF posterior,
+    extended to separate horizontal, vertical, and diagonal couplings,
+    and with optional simulated annealing and likelihood term.
+
+    Energy convention:
+        E(X|Y) = Σ_k [
+            α * X_k
+            + (β_h * X_k * Σ_horiz N_h)
+            + (β_v * X_k * Σ_vert N_v)
+            + (β_d1 * X_k * Σ_diag1 N_d1)
+            + (β_d2 * X_k * Σ_diag2 N_d2)
+            - λ * Y_k * X_k
+        ]
+    and states are weighted by exp(-E / T).
+
+    Notes:
+    - β_h, β_v, β_d1, β_d2 < 0 → alignment in corresponding directions.
+    - λ > 0 → attraction to observed data (data fidelity).
+    - T controls randomness; can decay exponentially if anneal=True.
+
+    Parameters
+    ----------
+    Sample : 1D numpy array
+        Current spin configuration in {-1,+1} including a 1-pixel border.
+
+    height, width : int
+        True image size excluding the 1-pixel border.
+
+    ITERA : int
+        Number of full sweeps.
+
+    alpha : float
+        External field parameter.
+
+    Beta_h, Beta_v, Beta_d1, Beta_d2 : float
+        Coupling constants for horizontal, vertical, and diagonal neighbours.
+
+    T : float
+        Base temperature (used if anneal=False).
+
+    Yobs : 1D numpy array, optional
+        Observed noisy image (±1). If None, defaults to prior-only mode.
+
+    lam : float
+        Data fidelity term λ.
+
+    anneal : bool
+        Whether to apply simulated annealing.
+
+    T0, Tf : float, optional
+        Starting and final temperatures for annealing. Defaults: T0=T, Tf=0.1*T0.
+
+    Returns
+    -------
+    SampleOut : 2D numpy array (height x width)
+        Final denoised configuration (without padding).
+    """
+
+    # original image dimensions
+    H = height + 2
+    W = width + 2
+    Nsites = height * width
+
+    # fallback for missing Yobs
+    if Yobs is None:
+        Yobs = Sample
+
+    # annealing parameters
+    if anneal:
+        if T0 is None:
+            T0 = T
+        if Tf is None:
+            Tf = 0.1 * T0
+
+    # precompute interior indices
+    indices = np.zeros(Nsites, dtype=int)
+    t = 0
+    for i in range(1, H - 1):
+        for j in range(1, W - 1):
+            indices[t] = j + i * W
+            t += 1
+
+    # main Gibbs loop
+    for sweep in range(ITERA):
+
+        # simulated annealing schedule
+        if anneal:
+            T_eff = T0 * ((Tf / T0) ** (sweep / max(1, ITERA - 1)))
+        else:
+            T_eff = T
+
+        random.shuffle(indices)
+
+        for k in indices:
+            # observed pixel
+            yk = Yobs[k]
+
+            # compute local energy contribution from anisotropic neighbours
+            # horizontal: left/right
+            # vertical: up/down
+            # diagonal1: top-left / bottom-right
+            # diagonal2: top-right / bottom-left
+            energy = (
+                alpha
+                + Beta_h * (Sample[k - 1] + Sample[k + 1])
+                + Beta_v * (Sample[k - W] + Sample[k + W])
+                + Beta_d1 * (Sample[k - W - 1] + Sample[k + W + 1])
+                + Beta_d2 * (Sample[k - W + 1] + Sample[k + W - 1])
+                - lam * yk  # data fidelity term
+            )
+
+            # conditional probability 
+            p_plus = 1.0 / (1.0 + exp(2.0 * energy / T_eff))
+
+            # sample from Bernoulli
+            Sample[k] = 1 if random.random() < p_plus else -1
+
+    # reshape 1D sample into 2D output without border
+    SampleOut = np.zeros((H, W))
+    for i in range(1, H - 1):
+        for j in range(1, W - 1):
+            SampleOut[i][j] = Sample[j + i * W]
+
+    return SampleOut[1:-1, 1:-1]
+
+
+def legacy_AMetropolis(Sample,height,width,ITERA,Alpha,Beta_h, Beta_v, Beta_d1, Beta_d2,T,Yobs=None,lam=0.0,anneal=False,T0=None,Tf=None):
+    """
+    Anisotropic Metropolis-Hastings sampler for binary MRF denoising.
+
+    State convention:
+    - Sample[k] ∈ {-1,+1} is the current latent (clean) pixel value.
+    - Yobs[k]   ∈ {-1,+1} is the observed noisy pixel (fixed, does not change).
+    - The lattice is stored with a 1-pixel border around the true image.
+
+    Energy convention (anisotropic):
+        E(X|Y) = Σ_k [
+            Alpha        * X_k
+          + Beta_h  * X_k * (left+right)
+          + Beta_v  * X_k * (up+down)
+          + Beta_d1 * X_k * (diag ↘ / ↖)
+          + Beta_d2 * X_k * (diag ↗ / ↙)
+          - lam     * Y_k * X_k
+        ]
+
+    and states are weighted by exp( -E / T ).
+
+    Notes:
+    - Negative Beta_h, Beta_v, Beta_d1, Beta_d2 encourage alignment along their respective directions.
+    - lam > 0 encourages agreement with the observed data Yobs.
+    - T controls how often we accept energetically worse flips.
+    - anneal=True activates simulated annealing: T decays from T0 to Tf.
+
+    Parameters
+    ----------
+    Sample : 1D numpy array
+        Spin configuration (±1) including border. Will be modified in place.
+
+    height, width : int
+        True image dimensions (excluding the padding border).
+
+    ITERA : int
+        Number of full sweeps.
+
+    Alpha : float
+        Single-site bias term.
+
+    Beta_h, Beta_v, Beta_d1, Beta_d2 : float
+        Directional couplings:
+        - Beta_h  : horizontal (left/right)
+        - Beta_v  : vertical (up/down)
+        - Beta_d1 : main diagonal (top-left / bottom-right)
+        - Beta_d2 : other diagonal (top-right / bottom-left)
+
+    T : float
+        Base temperature for Metropolis acceptance if anneal=False.
+
+    Yobs : 1D numpy array, optional
+        Observed noisy image in {-1,+1}, same shape/indexing as Sample.
+        If None → prior-only version (no data term).
+
+    lam : float
+        Data fidelity weight λ. Higher λ forces agreement with Yobs.
+
+    anneal : bool
+        If True, enable exponential temperature decay across sweeps.
+
+    T0, Tf : float, optional
+        Start and end temperatures for annealing. Defaults: T0=T, Tf=0.1*T0.
+
+    Returns
+    -------
+    SampleOut_no_border : 2D numpy array of shape (height, width)
+        Final spin configuration cropped to remove the border.
+    """
+
+    H = height + 2   # total rows including 1-pixel border
+    W = width + 2    # total cols including 1-pixel border
+    Nsites = height * width  # number of interior pixels
+
+    # If Yobs is not provided, fall back to prior-only behaviour
+    if Yobs is None:
+        Yobs = Sample
+
+    # Annealing setup
+    if anneal:
+        if T0 is None:
+            T0 = T
+        if Tf is None:
+            Tf = 0.1 * T0
+
+    # Build list of interior indices (skip padded frame)
+    indices = np.zeros(Nsites, dtype=int)
+    t = 0
+    for i in range(1, H - 1):
+        for j in range(1, W - 1):
+            indices[t] = j + i * W
+            t += 1
+
+    # Main Metropolis loop over sweeps
+    for sweep in range(ITERA):
+
+        # Select current effective temperature for this sweep
+        if anneal:
+            # exponential decay from T0 down to Tf
+            T_eff = T0 * ((Tf / T0) ** (sweep / max(1, ITERA - 1)))
+        else:
+            T_eff = T
+
+        random.shuffle(indices)
+
+        for k in indices:
+            # Current spin at site k
+            current = Sample[k]  # ±1
+
+            # Proposed flip
+            candidate = -current
+
+            # Observed pixel value (data fidelity term)
+            yk = Yobs[k]  # ±1
+
+            # Compute local energy contribution before the flip:
+            # Minus lam * yk * spin is the likelihood attachment.
+            E_old = (
+                Alpha * current
+                + Beta_h  * (current * Sample[k - 1]       + current * Sample[k + 1])
+                + Beta_v  * (current * Sample[k - W]       + current * Sample[k + W])
+                + Beta_d1 * (current * Sample[k - W - 1]   + current * Sample[k + W + 1])
+                + Beta_d2 * (current * Sample[k - W + 1]   + current * Sample[k + W - 1])
+                - lam     * yk * current
+            )
+
+            # Compute local energy after flipping that one spin:
+            E_new = (
+                Alpha * candidate
+                + Beta_h  * (candidate * Sample[k - 1]       + candidate * Sample[k + 1])
+                + Beta_v  * (candidate * Sample[k - W]       + candidate * Sample[k + W])
+                + Beta_d1 * (candidate * Sample[k - W - 1]   + candidate * Sample[k + W + 1])
+                + Beta_d2 * (candidate * Sample[k - W + 1]   + candidate * Sample[k + W - 1])
+                - lam     * yk * candidate
+            )
+
+            Delta_E = E_new - E_old  # energy change for this flip
+
+            # Metropolis acceptance rule with temperature T_eff:
+            # If energy goes down (Delta_E < 0) accept immediately.
+            # Otherwise accept with prob exp(-Delta_E / T_eff).
+            if Delta_E < 0:
+                Sample[k] = candidate
+            else:
+                if random.random() < exp(-Delta_E / T_eff):
+                    Sample[k] = candidate
+
+    # Convert flattened lattice with border back to 2D and drop the artificial border
+    SampleOut = np.zeros((H, W))
+    for i in range(1, H - 1):
+        for j in range(1, W - 1):
+            SampleOut[i][j] = Sample[j + i * W]
+
+    SampleOut_no_border = SampleOut[1:-1, 1:-1]
+    return SampleOut_no_border
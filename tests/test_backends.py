@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from Isotropic.Metropolis import Metropolis
+from Isotropic.Gibbs import Gibbs
+from Anisotropic.AMetropolis import AMetropolis
+from Anisotropic.AGibbs import AGibbs
+
+pytest.importorskip("numba")
+from jit_backend import seed_jit
+from helpers import (HEIGHT, WIDTH, Alpha, Beta, T, lam, Beta_h, Beta_v, Beta_d1, Beta_d2,
+                     chain_means, random_sample, seed, z_scores)
+
+
+#Statistical equivalence of backend="python" (reference) and backend="numba",
+#see helpers for the chains and the z-score test.
+
+SAMPLERS = {
+    "Gibbs": lambda S, Y, n, b: Gibbs(S, HEIGHT, WIDTH, n, Alpha, Beta, T, Yobs=Y, lam=lam, backend=b),
+    "Metropolis": lambda S, Y, n, b: Metropolis(S, HEIGHT, WIDTH, n, Alpha, Beta, T, Yobs=Y, lam=lam, backend=b),
+    "AGibbs": lambda S, Y, n, b: AGibbs(S, HEIGHT, WIDTH, n, Alpha, Beta_h, Beta_v, Beta_d1, Beta_d2, T,
+                                        Yobs=Y, lam=lam, backend=b),
+    "AMetropolis": lambda S, Y, n, b: AMetropolis(S, HEIGHT, WIDTH, n, Alpha, Beta_h, Beta_v, Beta_d1, Beta_d2, T,
+                                                  Yobs=Y, lam=lam, backend=b),
+}
+
+
+@pytest.mark.parametrize("name", SAMPLERS)
+def test_numba_matches_python(name):
+    seed(0)
+    seed_jit(0)
+    Y = random_sample()
+    run = SAMPLERS[name]
+    ref = chain_means(lambda S, Y, n: run(S, Y, n, "python"), Y)
+    jit = chain_means(lambda S, Y, n: run(S, Y, n, "numba"), Y)
+    z = z_scores(ref, jit)
+    assert np.all(z < 4), f"{name}: |z| = {np.round(z, 2)}"
+
+
+@pytest.mark.parametrize("name", SAMPLERS)
+def test_numba_keeps_sample_in_place(name):
+    np.random.seed(1)
+    seed_jit(1)
+    S = random_sample()
+    X = SAMPLERS[name](S, random_sample(), 10, "numba")
+    assert np.array_equal(S.reshape(HEIGHT + 2, WIDTH + 2)[1:-1, 1:-1], X)
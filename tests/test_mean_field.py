@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from replica_phase_transitions.mean_field import solve
+
+
+@pytest.mark.parametrize("method", ["mf", "bethe", "tap"])
+def test_uncoupled_limit(method):
+    # Beta = 0: independent sites, m = tanh(λY/T), overlap (1-2p) tanh(λ/T)
+    noise = np.linspace(0.0, 0.5, 6)
+    res = solve(noise, 0.0, 0.7, T=1.3, method=method)
+    np.testing.assert_allclose(res["overlap"], (1 - 2 * noise) * np.tanh(0.7 / 1.3), atol=1e-9)
+    assert res["converged"].all()
+
+
+@pytest.mark.parametrize("z", [3, 4, 6])
+def test_bethe_critical_point(z):
+    # without field, order appears at tanh K_c = 1/(z-1)
+    K_c = np.arctanh(1.0 / (z - 1))
+    T = 1.0
+    below = solve(0.0, -0.9 * K_c * T, 0.0, T=T, z=z, method="bethe", max_iter=20000)
+    above = solve(0.0, -1.1 * K_c * T, 0.0, T=T, z=z, method="bethe", max_iter=20000)
+    assert abs(below["overlap"]) < 1e-6
+    assert above["overlap"] > 0.1
+
+
+@pytest.mark.parametrize("method", ["mf", "bethe", "tap"])
+def test_grid_broadcasting(method):
+    noise = np.array([0.0, 0.1, 0.3])[:, None]
+    Beta = np.array([-0.2, -0.1, 0.0, 0.1])[None, :]
+    res = solve(noise, Beta, 0.5, T=1.0, method=method)
+    for key in ("overlap", "mismatch", "error", "mismatch_map", "iterations", "converged"):
+        assert res[key].shape == (3, 4)
+    assert res["m"].shape == (3, 4, 2)
+    for i in range(3):
+        for j in range(4):
+            single = solve(noise[i, 0], Beta[0, j], 0.5, T=1.0, method=method)
+            np.testing.assert_allclose(res["overlap"][i, j], single["overlap"], atol=1e-9)
+
+
+def test_gaussian_channel_grid():
+    res = solve(np.array([0.1, 0.5, 1.0]), -0.1, 1.0, channel="gaussian", method="bethe")
+    assert res["overlap"].shape == (3,)
+    assert np.all(np.diff(res["overlap"]) < 0)
+
+
+def test_non_convergence_warns():
+    with pytest.warns(UserWarning, match="did not converge"):
+        res = solve(0.1, -0.3, 0.5, method="bethe", max_iter=3)
+    assert not res["converged"].any()
+    assert res["iterations"] == 3
+
+
+def test_invalid_method_is_rejected():
+    with pytest.raises(ValueError, match="Unknown method"):
+        solve(0.1, -0.3, 0.5, method="rs")
@@ -0,0 +1,82 @@
+import importlib.util
+import numpy as np
+import pytest
+from Isotropic.Gibbs import Gibbs
+from Anisotropic.AGibbs import AGibbs
+from reweighting import HistogramRecorder, reweight
+from helpers import Alpha, T, lam, random_sample, seed
+
+
+#Single and multiple histogram reweighting against direct runs.
+
+HEIGHT = 12
+WIDTH = 12
+N = HEIGHT * WIDTH
+BURN_IN = 200
+BACKEND = "numba" if importlib.util.find_spec("numba") is not None else "python"
+
+
+def run(Beta, Y, sweeps, **kwargs):
+    rec = HistogramRecorder(HEIGHT, WIDTH, Alpha, Beta, lam, T, Yobs=Y, burn_in=BURN_IN,
+                            observables={"overlap": lambda X: (X * Y.reshape(HEIGHT + 2, WIDTH + 2)[1:-1, 1:-1]).mean()})
+    Gibbs(Y.copy(), HEIGHT, WIDTH, BURN_IN + sweeps, Alpha, Beta, T, Yobs=Y, lam=lam,
+          backend=BACKEND, recorder=rec, **kwargs)
+    return rec
+
+
+@pytest.fixture(scope="module")
+def Y():
+    seed(7)
+    if BACKEND == "numba":
+        from jit_backend import seed_jit
+        seed_jit(7)
+    return random_sample(HEIGHT, WIDTH)
+
+
+def test_single_run_at_reference_is_the_time_average(Y):
+    rec = run(-0.3, Y, 400)
+    res = reweight(rec)
+    stats = rec.stats
+    np.testing.assert_allclose(res["mean"]["magnetization"], stats[:, 0].mean() / N)
+    np.testing.assert_allclose(res["mean"]["interaction"], stats[:, 1].mean() / N)
+    np.testing.assert_allclose(res["mean"]["data"], stats[:, 2].mean() / N)
+    np.testing.assert_allclose(res["mean"]["overlap"], np.mean(rec._obs))
+    assert res["tau"] >= 1.0 and res["ess"] <= len(rec)
+
+
+def test_wham_matches_direct_run_at_intermediate_beta(Y):
+    runs = [run(b, Y, 3000) for b in (-0.3, -0.45)]
+    res = reweight(runs, Beta=-0.375)
+    direct = reweight(run(-0.375, Y, 3000))
+    for name in ("magnetization", "interaction", "data", "energy", "overlap"):
+        diff = abs(res["mean"][name] - direct["mean"][name])
+        se = np.hypot(res["error"][name], direct["error"][name])
+        assert diff < 4 * se, f"{name}: {res['mean'][name]} vs {direct['mean'][name]} ± {se}"
+
+
+def test_far_target_warns_about_low_ess(Y):
+    rec = run(-0.3, Y, 400)
+    with pytest.warns(UserWarning, match="effective samples"):
+        res = reweight(rec, Beta=[-0.3, -1.5])
+    assert res["ess"][1] < 50 < res["ess"][0]
+
+
+def test_prior_only_recorder_requires_lam_zero():
+    with pytest.raises(ValueError, match="Yobs=None"):
+        HistogramRecorder(HEIGHT, WIDTH, Alpha, -0.3, lam, T)
+
+
+def test_samplers_reject_runs_that_cannot_be_reweighted(Y):
+    with pytest.raises(ValueError, match="anneal"):
+        run(-0.3, Y, 10, anneal=True)
+
+    rec = HistogramRecorder(HEIGHT, WIDTH, Alpha, -0.3, lam, T, Yobs=Y)
+    with pytest.raises(ValueError, match="isotropic kernel"):
+        AGibbs(Y.copy(), HEIGHT, WIDTH, 10, Alpha, -0.3, -0.3, -0.1, -0.1, T, Yobs=Y, lam=lam, recorder=rec)
+    with pytest.raises(ValueError, match="isotropic kernel"):
+        Gibbs(Y.copy(), HEIGHT, WIDTH, 10, Alpha, -0.4, T, Yobs=Y, lam=lam, recorder=rec)
+    with pytest.raises(ValueError, match="differ"):
+        Gibbs(Y.copy(), HEIGHT, WIDTH, 10, Alpha, -0.3, 2 * T, Yobs=Y, lam=lam, recorder=rec)
+    with pytest.raises(ValueError, match="Yobs"):
+        Gibbs(Y.copy(), HEIGHT, WIDTH, 10, Alpha, -0.3, T, Yobs=-Y, lam=lam, recorder=rec)
+    assert len(rec) == 0
@@ -0,0 +1,150 @@
+import importlib.util
+import numpy as np
+import pytest
+import jit_backend
+from Isotropic.Metropolis import Metropolis
+from Isotropic.Gibbs import Gibbs
+from Anisotropic.AMetropolis import AMetropolis
+from Anisotropic.AGibbs import AGibbs
+from stencil import StencilSampler, anisotropic_kernel, colouring, isotropic_kernel, _support
+from legacy_samplers import legacy_AGibbs, legacy_AMetropolis, legacy_Gibbs, legacy_Metropolis
+from helpers import (HEIGHT, WIDTH, Alpha, Beta, T, lam, Beta_h, Beta_v, Beta_d1, Beta_d2,
+                     chain_means, random_sample, seed, z_scores)
+
+
+#--- wrappers against the original loops ---
+
+@pytest.mark.parametrize("legacy, wrapper", [(legacy_Gibbs, Gibbs), (legacy_Metropolis, Metropolis)])
+@pytest.mark.parametrize("anneal", [False, True])
+def test_isotropic_wrappers_reproduce_legacy(legacy, wrapper, anneal):
+    # same RNG calls (np.random.shuffle, random.random) -> same trajectory
+    Y = random_sample()
+    S0 = random_sample()
+    seed(3)
+    S_old = S0.copy()
+    X_old = legacy(S_old, HEIGHT, WIDTH, 30, Alpha, Beta, T, Yobs=Y, lam=lam, anneal=anneal, T0=2.0)
+    seed(3)
+    S_new = S0.copy()
+    X_new = wrapper(S_new, HEIGHT, WIDTH, 30, Alpha, Beta, T, Yobs=Y, lam=lam, anneal=anneal, T0=2.0)
+    assert np.array_equal(X_old, X_new)
+    assert np.array_equal(S_old, S_new)
+
+
+@pytest.mark.parametrize("legacy, wrapper", [(legacy_AGibbs, AGibbs), (legacy_AMetropolis, AMetropolis)])
+def test_anisotropic_wrappers_match_legacy(legacy, wrapper):
+    # the shuffle moved from random.shuffle to np.random.shuffle: compare
+    # statistically (the wrapper side uses Numba when available, its
+    # equivalence with the Python path is tested in test_backends.py)
+    seed(4)
+    backend = "python"
+    if importlib.util.find_spec("numba") is not None:
+        from jit_backend import seed_jit
+        seed_jit(4)
+        backend = "numba"
+    Y = random_sample()
+    args = (Alpha, Beta_h, Beta_v, Beta_d1, Beta_d2, T)
+    old = chain_means(lambda S, Y, n: legacy(S, HEIGHT, WIDTH, n, *args, Yobs=Y, lam=lam), Y)
+    new = chain_means(lambda S, Y, n: wrapper(S, HEIGHT, WIDTH, n, *args, Yobs=Y, lam=lam, backend=backend), Y)
+    z = z_scores(old, new)
+    assert np.all(z < 4), f"|z| = {np.round(z, 2)}"
+
+
+#--- colour scan against random scan ---
+
+K5 = np.full((5, 5), -0.04)
+K5[2, 2] = 0
+
+KERNELS = {
+    "isotropic": isotropic_kernel(Beta),
+    "anisotropic": anisotropic_kernel(Beta_h, Beta_v, Beta_d1, Beta_d2),
+    "5x5": K5,
+}
+
+
+@pytest.mark.parametrize("method", ["gibbs", "metropolis"])
+@pytest.mark.parametrize("kernel", KERNELS)
+def test_colour_scan_matches_random_scan(kernel, method):
+    pytest.importorskip("numba")
+    from jit_backend import seed_jit
+    seed(5)
+    seed_jit(5)
+    Y = random_sample()
+    K = KERNELS[kernel]
+
+    def run(scan, backend):
+        return lambda S, Y, n: StencilSampler(S, HEIGHT, WIDTH, n, K, Alpha, T, Yobs=Y, lam=lam,
+                                              method=method, scan=scan, backend=backend)
+
+    ref = chain_means(run("random", "numba"), Y)
+    col = chain_means(run("colour", "python"), Y)
+    z = z_scores(ref, col)
+    assert np.all(z < 4), f"|z| = {np.round(z, 2)}"
+
+
+def test_colour_scan_warns_for_numba_backend():
+    with pytest.warns(UserWarning, match="no effect") as record:
+        StencilSampler(random_sample(), HEIGHT, WIDTH, 1, K5, 0.0, T, scan="colour", backend="numba")
+    assert record[0].filename == __file__
+    with pytest.warns(UserWarning, match="no effect") as record:
+        Gibbs(random_sample(), HEIGHT, WIDTH, 1, Alpha, Beta, T, scan="colour", backend="numba")
+    assert record[0].filename == __file__
+
+
+@pytest.mark.parametrize("scan", ["random", "colour"])
+def test_unknown_backend_is_rejected(scan):
+    with pytest.raises(ValueError, match="Unknown backend"):
+        Gibbs(random_sample(), HEIGHT, WIDTH, 1, Alpha, Beta, T, scan=scan, backend="nmba")
+
+
+@pytest.mark.parametrize("name, run", [
+    ("StencilSampler", lambda S: StencilSampler(S, HEIGHT, WIDTH, 1, K5, Alpha, T, backend="numba")),
+    ("Gibbs", lambda S: Gibbs(S, HEIGHT, WIDTH, 1, Alpha, Beta, T, backend="numba")),
+    ("AMetropolis", lambda S: AMetropolis(S, HEIGHT, WIDTH, 1, Alpha, Beta_h, Beta_v, Beta_d1, Beta_d2, T,
+                                          backend="numba")),
+])
+def test_fallback_warning_names_the_called_sampler(monkeypatch, name, run):
+    # simulate a missing Numba: the warning names the sampler and points at this file
+    monkeypatch.setattr(jit_backend, "njit", None)
+    with pytest.warns(UserWarning, match=f"{name} falls back") as record:
+        run(random_sample())
+    assert record[0].filename == __file__
+
+
+#--- colouring ---
+
+def symmetric_kernel(shape, seed_):
+    rng = np.random.default_rng(seed_)
+    K = rng.normal(size=shape)
+    K = K + K[::-1, ::-1]
+    K[shape[0] // 2, shape[1] // 2] = 0
+    return K
+
+
+@pytest.mark.parametrize("kernel", [
+    isotropic_kernel(-1.0),
+    anisotropic_kernel(-1.0, -1.0, -1.0, -1.0),
+    K5,
+    symmetric_kernel((3, 5), 0),
+    symmetric_kernel((5, 7), 1),
+    symmetric_kernel((1, 5), 2),
+])
+def test_colouring_separates_coupled_sites(kernel):
+    a, b, m = colouring(kernel)
+    i, j = np.mgrid[0:30, 0:30]
+    colour = (a * i + b * j) % m
+    for di, dj in zip(*_support(kernel)):
+        c1 = colour[max(0, -di):30 - max(0, di), max(0, -dj):30 - max(0, dj)]
+        c2 = colour[max(0, di):30 + min(0, di), max(0, dj):30 + min(0, dj)]
+        assert np.all(c1 != c2), f"offset ({di}, {dj}) shares a colour"
+
+
+def test_colouring_sizes():
+    assert colouring(isotropic_kernel(-1.0)) == (1, 1, 2)
+    assert colouring(anisotropic_kernel(-1.0, -1.0, -1.0, -1.0))[2] == 4
+    assert colouring(K5)[2] == 9
+
+
+@pytest.mark.parametrize("kernel", [np.zeros((2, 3)), np.ones((3, 3)), np.array([[0.0, 1.0, 2.0]])])
+def test_invalid_kernels_are_rejected(kernel):
+    with pytest.raises(ValueError):
+        colouring(kernel)
@@ -0,0 +1,70 @@
+import json
+import os
+import numpy as np
+import pytest
+from Isotropic.Gibbs import Gibbs
+from trajectory import Trajectory, TrajectoryRecorder
+from helpers import HEIGHT, WIDTH, Alpha, Beta, T, lam, random_sample, seed
+
+
+class CopyingRecorder(TrajectoryRecorder):
+    """TrajectoryRecorder that also keeps an in-memory copy of every snapshot."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.copies = {}
+
+    def append(self, sweep, Sample):
+        self.copies[sweep] = Sample.reshape(HEIGHT + 2, WIDTH + 2)[1:-1, 1:-1].copy()
+        super().append(sweep, Sample)
+
+
+@pytest.mark.parametrize("compress", [True, False])
+@pytest.mark.parametrize("backend", ["python", "numba"])
+def test_round_trip(tmp_path, compress, backend):
+    if backend == "numba":
+        pytest.importorskip("numba")
+    seed(0)
+    Y = random_sample()
+    path = str(tmp_path / "run")
+    with CopyingRecorder(path, HEIGHT, WIDTH, every=3, chunk=2, compress=compress,
+                         initial=True, final=True) as rec:
+        X = Gibbs(Y.copy(), HEIGHT, WIDTH, 10, Alpha, Beta, T, Yobs=Y, lam=lam, backend=backend, recorder=rec)
+
+    traj = Trajectory(path)
+    assert traj.sweeps == [0, 3, 6, 9, 10]
+    assert sorted(rec.copies) == traj.sweeps
+    for i, sweep in enumerate(traj.sweeps):
+        np.testing.assert_array_equal(traj[i], rec.copies[sweep])
+        np.testing.assert_array_equal(traj.at_sweep(sweep), rec.copies[sweep])
+    np.testing.assert_array_equal(traj.at_sweep(0), Y.reshape(HEIGHT + 2, WIDTH + 2)[1:-1, 1:-1])
+    np.testing.assert_array_equal(traj[-1], X)
+    if not compress:
+        assert isinstance(traj._load_chunk(0), np.memmap)
+    with pytest.raises(KeyError):
+        traj.at_sweep(4)
+
+
+def test_meta_is_constant_size_and_stale_chunks_are_removed(tmp_path):
+    path = str(tmp_path / "run")
+    with TrajectoryRecorder(path, HEIGHT, WIDTH, every=1, chunk=4) as rec:
+        Gibbs(random_sample(), HEIGHT, WIDTH, 12, Alpha, Beta, T, recorder=rec)
+    size = os.path.getsize(os.path.join(path, "meta.json"))
+
+    # a new recorder in the same directory starts from an empty, readable trajectory
+    rec = TrajectoryRecorder(path, HEIGHT, WIDTH, every=1, chunk=4)
+    assert len(Trajectory(path)) == 0
+    assert not [f for f in os.listdir(path) if f.startswith("chunk_")]
+    Gibbs(random_sample(), HEIGHT, WIDTH, 400, Alpha, Beta, T, recorder=rec)
+    rec.close()
+    with open(os.path.join(path, "meta.json")) as f:
+        assert json.load(f)["count"] == 400
+    assert os.path.getsize(os.path.join(path, "meta.json")) <= size + 2
+
+
+def test_snapshots_must_come_from_one_run(tmp_path):
+    rec = TrajectoryRecorder(str(tmp_path / "run"), HEIGHT, WIDTH, every=2)
+    S = random_sample()
+    Gibbs(S, HEIGHT, WIDTH, 4, Alpha, Beta, T, recorder=rec)
+    with pytest.raises(ValueError, match="single run"):
+        Gibbs(S, HEIGHT, WIDTH, 4, Alpha, Beta, T, recorder=rec)
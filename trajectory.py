@@ -0,0 +1,222 @@
+import glob
+import json
+import os
+import numpy as np
+from PIL import Image
+
+
+class TrajectoryRecorder:
+    """
+    Records spin snapshots during a single sampler run.
+
+    Every `every` sweeps the sampler calls append(sweep, Sample); the interior
+    spins are bit-packed (1 bit per pixel) and buffered. Once `chunk` snapshots
+    are buffered they are flushed to disk as one chunk file, so memory stays
+    bounded by a single chunk however long the run is.
+
+    The recorded sweeps are 0 (with initial=True), every, 2*every, ... and
+    the last sweep (with final=True, when ITERA is not a multiple of every),
+    so only their count is stored. meta.json is written at start-up and
+    after every flush, so a run that stops early still leaves a readable
+    trajectory of the flushed chunks.
+
+    On-disk layout (a directory):
+        meta.json          height, width, every, chunk, compress, initial, count, final
+        chunk_00000.npy    packed snapshots, memory-mappable   (compress=False)
+        chunk_00000.npz    same, zlib-compressed               (compress=True)
+
+    Parameters
+    ----------
+    path : str
+        Output directory (created if missing). Chunk files of an earlier run
+        in the same directory are removed.
+
+    height, width : int
+        True image dimensions (without border).
+
+    every : int
+        Record one snapshot every `every` sweeps.
+
+    chunk : int
+        Number of snapshots per chunk file.
+
+    compress : bool
+        Compress chunks with zlib. Uncompressed chunks can be memory-mapped.
+
+    initial : bool
+        Also record the starting configuration as sweep 0.
+
+    final : bool
+        Also record the final configuration when ITERA is not a multiple
+        of every.
+    """
+
+    def __init__(self, path, height, width, every=1, chunk=64, compress=True, initial=False, final=False):
+        if every < 1 or chunk < 1:
+            raise ValueError("every and chunk must be >= 1")
+        self.path = path
+        self.height = height
+        self.width = width
+        self.every = every
+        self.chunk = chunk
+        self.compress = compress
+        self.initial = initial
+        self.final = final
+        self._has_initial = False
+        self._count = 0
+        self._last = None
+        self._buffer = []
+        self._nchunks = 0
+        os.makedirs(path, exist_ok=True)
+        for old in glob.glob(os.path.join(path, "chunk_*")):
+            os.remove(old)
+        self._write_meta()
+
+    def __len__(self):
+        return self._has_initial + self._count + (self._last is not None)
+
+    def append(self, sweep, Sample):
+        """Store the interior of Sample (1D, padded) as the state after `sweep` sweeps."""
+        sweep = int(sweep)
+        if sweep == 0 and len(self) == 0:
+            self._has_initial = True
+        elif self._last is None and sweep == (self._count + 1) * self.every:
+            self._count += 1
+        elif self._last is None and self._count * self.every < sweep < (self._count + 1) * self.every:
+            self._last = sweep
+        else:
+            raise ValueError(f"sweep {sweep} does not continue the recorded run, "
+                             "a recorder holds the snapshots of a single run in order")
+        X = np.asarray(Sample).reshape(self.height + 2, self.width + 2)[1:-1, 1:-1]
+        self._buffer.append(np.packbits(X.ravel() > 0))
+        if len(self._buffer) == self.chunk:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        bits = np.stack(self._buffer)
+        name = os.path.join(self.path, f"chunk_{self._nchunks:05d}")
+        if self.compress:
+            np.savez_compressed(name + ".npz", bits=bits)
+        else:
+            np.save(name + ".npy", bits)
+        self._nchunks += 1
+        self._buffer = []
+        self._write_meta()
+
+    def _write_meta(self):
+        meta = {
+            "height": self.height,
+            "width": self.width,
+            "every": self.every,
+            "chunk": self.chunk,
+            "compress": self.compress,
+            "initial": self._has_initial,
+            "count": self._count,
+            "final": self._last,
+        }
+        with open(os.path.join(self.path, "meta.json"), "w") as f:
+            json.dump(meta, f)
+
+    def close(self):
+        """Flush the last (possibly partial) chunk."""
+        self._flush()
+        self._write_meta()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Trajectory:
+    """
+    Read access to a directory written by TrajectoryRecorder.
+
+    traj[i] returns the i-th recorded snapshot and traj.at_sweep(s) the one
+    recorded after sweep s, both as 2D arrays of ±1 (height, width).
+    Only the chunk containing the requested snapshot is loaded; uncompressed
+    chunks are memory-mapped.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        self.height = meta["height"]
+        self.width = meta["width"]
+        self.every = meta["every"]
+        self.chunk = meta["chunk"]
+        self.compress = meta["compress"]
+        self._initial = int(meta["initial"])
+        self._count = meta["count"]
+        self._final = meta["final"]
+        self._cache = (None, None)
+
+    def __len__(self):
+        return self._initial + self._count + (self._final is not None)
+
+    @property
+    def sweeps(self):
+        """Recorded sweep numbers, in order."""
+        sweeps = [0] if self._initial else []
+        sweeps += range(self.every, (self._count + 1) * self.every, self.every)
+        if self._final is not None:
+            sweeps.append(self._final)
+        return sweeps
+
+    def _load_chunk(self, c):
+        if self._cache[0] != c:
+            name = os.path.join(self.path, f"chunk_{c:05d}")
+            if self.compress:
+                with np.load(name + ".npz") as f:
+                    bits = f["bits"]
+            else:
+                bits = np.load(name + ".npy", mmap_mode="r")
+            self._cache = (c, bits)
+        return self._cache[1]
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("snapshot index out of range")
+        bits = self._load_chunk(i // self.chunk)[i % self.chunk]
+        spins = np.unpackbits(bits, count=self.height * self.width)
+        return (2.0 * spins - 1.0).reshape(self.height, self.width)
+
+    def at_sweep(self, sweep):
+        """Snapshot recorded after `sweep` sweeps (KeyError if not recorded)."""
+        if sweep == 0 and self._initial:
+            return self[0]
+        if sweep % self.every == 0 and 1 <= sweep // self.every <= self._count:
+            return self[self._initial + sweep // self.every - 1]
+        if self._final is not None and sweep == self._final:
+            return self[len(self) - 1]
+        raise KeyError(f"sweep {sweep} was not recorded")
+
+    def _frame(self, i):
+        # +1 -> white, -1 -> black, as plt.imshow(..., cmap='gray')
+        return Image.fromarray(((self[i] > 0) * 255).astype(np.uint8))
+
+    def to_images(self, folder, prefix="sweep"):
+        """Write one PNG per snapshot, named <prefix>_<sweep>.png."""
+        os.makedirs(folder, exist_ok=True)
+        for i, sweep in enumerate(self.sweeps):
+            self._frame(i).save(os.path.join(folder, f"{prefix}_{sweep}.png"))
+
+    def to_gif(self, filename, duration=100, scale=1):
+        """
+        Write the trajectory as an animated GIF.
+
+        duration : milliseconds per frame.
+        scale    : integer upscaling factor for small lattices.
+        """
+        if len(self) == 0:
+            raise ValueError("empty trajectory")
+        size = (self.width * scale, self.height * scale)
+        frames = (self._frame(i).resize(size, Image.NEAREST) for i in range(len(self)))
+        first = next(frames)
+        first.save(filename, save_all=True, append_images=frames, duration=duration, loop=0)